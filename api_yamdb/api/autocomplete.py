@@ -0,0 +1,228 @@
+import heapq
+from bisect import bisect_left, insort
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+
+from api.cache import get_versions
+from reviews.models import Title
+
+# Сколько точечных изменений копится поверх основного списка ключей,
+# прежде чем он пересобирается слиянием.
+DELTA_LIMIT = 1024
+# Пустой лист дерева рангов: хуже любого ранга.
+EMPTY = (float('inf'),)
+# Верхняя граница для ключей, начинающихся с префикса.
+LAST_CHAR = chr(0x10FFFF)
+
+
+def normalize(value):
+    """Название для поиска: без регистра, ё как е, одиночные пробелы."""
+    return ' '.join(value.casefold().replace('ё', 'е').split())
+
+
+def index_keys(pk, name):
+    """Ключи для префиксного поиска с начала каждого слова названия."""
+    words = normalize(name).split(' ')
+    return [(' '.join(words[start:]), pk) for start in range(len(words))]
+
+
+def rank_key(pk, row):
+    """Порядок подсказок: выше рейтинг, больше отзывов, раньше создано."""
+    _, rating, review_count = row
+    return (-(rating or 0), -review_count, pk)
+
+
+def build_tree(keys, titles):
+    """
+    Дерево минимумов rank_key над отсортированными ключами.
+
+    Лист i — ранг произведения ключа keys[i], узел — лучший ранг
+    своего отрезка; пустые листья содержат EMPTY.
+    """
+    size = 1
+    while size < len(keys):
+        size *= 2
+    ranks = {pk: rank_key(pk, row) for pk, row in titles.items()}
+    tree = [EMPTY] * (2 * size)
+    for position, (_, pk) in enumerate(keys):
+        tree[size + position] = ranks[pk]
+    for node in range(size - 1, 0, -1):
+        tree[node] = min(tree[2 * node], tree[2 * node + 1])
+    return tree
+
+
+def ranked(tree, low, high):
+    """
+    Позиции ключей из [low, high) в порядке ранга, лениво.
+
+    Отрезок раскладывается на O(log n) узлов дерева, дальше куча
+    раскрывает только лучшие из них: k первых позиций стоят
+    O(k log n), сколько бы ключей ни было в отрезке.
+    """
+    size = len(tree) // 2
+    heap = []
+    low, high = low + size, high + size
+    while low < high:
+        if low & 1:
+            heap.append((tree[low], low))
+            low += 1
+        if high & 1:
+            high -= 1
+            heap.append((tree[high], high))
+        low, high = low // 2, high // 2
+    heapq.heapify(heap)
+    while heap:
+        rank, node = heapq.heappop(heap)
+        if node >= size:
+            yield rank, node - size
+            continue
+        for child in (2 * node, 2 * node + 1):
+            if tree[child] is not EMPTY:
+                heapq.heappush(heap, (tree[child], child))
+
+
+def prefix_range(keys, prefix):
+    """Отрезок ключей, начинающихся с prefix."""
+    return (
+        bisect_left(keys, (prefix,)),
+        bisect_left(keys, (prefix + LAST_CHAR,))
+    )
+
+
+class PrefixIndex:
+    """
+    Отсортированный список ключей названий для подсказок.
+
+    Строится при первом запросе и перестраивается, когда меняется
+    метка версии произведений (запись из другого процесса, импорт)
+    или проходит AUTOCOMPLETE_TTL (рейтинги меняются отзывами).
+    Записи через TitleViewSet этого процесса вносятся точечно.
+
+    Над списком строится дерево минимумов рангов (build_tree), поэтому
+    лучшие k подсказок находятся без перебора всех совпадений.
+    Точечные записи копятся в небольших добавках (новые ключи,
+    удалённые ключи, новые строки) и сливаются с основным списком,
+    когда их становится больше DELTA_LIMIT. Все части заменяются
+    одним кортежем, поэтому поиск читает их без блокировки.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.stamp = None
+        self.built = 0.0
+        self.data = self.merged([], {}, [], frozenset(), {})
+
+    def is_stale(self, stamp):
+        return (stamp != self.stamp
+                or monotonic() - self.built > settings.AUTOCOMPLETE_TTL)
+
+    def load(self):
+        stamp, = get_versions(('title',))
+        if self.is_stale(stamp):
+            with self.lock:
+                # Пока ждали блокировку, индекс мог перестроить
+                # другой поток.
+                if self.is_stale(stamp):
+                    self.rebuild(stamp)
+        return self
+
+    def rebuild(self, stamp):
+        rows = Title.objects.filter(is_deleted=False).values_list(
+            'id', 'name', 'rating', 'review_count'
+        )
+        titles = {pk: tuple(row) for pk, *row in rows}
+        self.data = self.merged([], titles, [], frozenset(), {})
+        self.stamp = stamp
+        self.built = monotonic()
+
+    def update(self, pk, stamp_before, stamp_after):
+        """
+        Вносит в индекс запись одного произведения.
+
+        Копируются только добавки, а не весь список. Ключи основного
+        списка изменённого произведения всегда уходят в удалённые:
+        ранги в дереве у оставшихся ключей остаются верными. Если
+        индекс отстал ещё до этой записи, оставляет его перестроение
+        load().
+        """
+        with self.lock:
+            if self.stamp != stamp_before:
+                return
+            keys, titles, tree, added, removed, changed = self.data
+            added, removed, changed = list(added), set(removed), dict(changed)
+            old = changed[pk] if pk in changed else titles.get(pk)
+            if old is not None:
+                for key in index_keys(pk, old[0]):
+                    position = bisect_left(added, key)
+                    if position < len(added) and added[position] == key:
+                        del added[position]
+                    else:
+                        removed.add(key)
+            row = Title.objects.filter(pk=pk, is_deleted=False).values_list(
+                'name', 'rating', 'review_count'
+            ).first()
+            changed[pk] = row
+            if row is not None:
+                for key in index_keys(pk, row[0]):
+                    insort(added, key)
+            if len(added) + len(removed) > DELTA_LIMIT:
+                self.data = self.merged(keys, titles, added, removed, changed)
+            else:
+                self.data = (
+                    keys, titles, tree, added, frozenset(removed), changed
+                )
+            self.stamp = stamp_after
+
+    @staticmethod
+    def merged(keys, titles, added, removed, changed):
+        """Основной список, строки и дерево со слитыми добавками."""
+        titles = {
+            pk: row
+            for pk, row in {**titles, **changed}.items() if row is not None
+        }
+        if keys:
+            keys = list(heapq.merge(
+                (key for key in keys if key not in removed), added
+            ))
+        else:
+            keys = sorted(
+                key
+                for pk, (name, _, _) in titles.items()
+                for key in index_keys(pk, name)
+            )
+        return (keys, titles, build_tree(keys, titles), [], frozenset(), {})
+
+    def search(self, query, limit):
+        """limit лучших по рейтингу и числу отзывов названий с префиксом."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        keys, titles, tree, added, removed, changed = self.data
+        base = (
+            (rank, keys[position][1])
+            for rank, position in ranked(tree, *prefix_range(keys, prefix))
+            if keys[position] not in removed
+        )
+        low, high = prefix_range(added, prefix)
+        extra = sorted(
+            (rank_key(pk, changed[pk]), pk) for _, pk in added[low:high]
+        )
+        found = []
+        for _, pk in heapq.merge(base, extra):
+            if pk not in found:
+                found.append(pk)
+                if len(found) == limit:
+                    break
+
+        def row(pk):
+            return changed[pk] if pk in changed else titles[pk]
+
+        return [
+            {'id': pk, 'name': row(pk)[0], 'rating': row(pk)[1]}
+            for pk in found
+        ]
+
+
+title_index = PrefixIndex()
@@ -0,0 +1,179 @@
+import hashlib
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+
+VERSION_KEY = 'version:{}'
+RESPONSE_KEY = 'response:{}'
+# Заголовки ответа, которые сохраняются вместе с телом: ключ кэша
+# зависит от Accept, и нижестоящим кэшам нужен тот же Vary.
+CACHED_HEADERS = ('Content-Type', 'Vary', 'Allow')
+# Метка массовых правок (команды, удаление пользователей): входит во
+# все ETag, построенные по меткам отдельных объектов.
+BULK_VERSION = 'bulk'
+
+
+def object_version(name, pk):
+    """Имя метки одного объекта, например `title:42`."""
+    # `042` из URL и 42 из сигнала — одна и та же метка.
+    if isinstance(pk, str) and pk.isdigit():
+        pk = int(pk)
+    return f'{name}:{pk}'
+
+
+def get_versions(names):
+    """
+    Текущие метки версий моделей.
+
+    Метка — случайный токен, а не счётчик: после очистки кэша
+    она не совпадёт ни с одной из уже выданных.
+    """
+    keys = [VERSION_KEY.format(name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return tuple(versions[key] for key in keys)
+
+
+def bump_versions(*names):
+    """Выдаёт моделям новые метки версий."""
+    cache.set_many(
+        {VERSION_KEY.format(name): uuid4().hex for name in names}, None
+    )
+
+
+def bump_versions_on_commit(*names):
+    # Метка меняется только после фиксации транзакции, иначе
+    # читатель успеет закэшировать старые данные под новой меткой.
+    if names:
+        transaction.on_commit(lambda: bump_versions(*names))
+
+
+def request_signature(request, versions):
+    """Ключ запроса: путь, отсортированные параметры и версии."""
+    query = sorted(
+        (key, value)
+        for key, values in request.GET.lists()
+        for value in values
+    )
+    raw = '|'.join((
+        request.path,
+        repr(query),
+        request.META.get('HTTP_ACCEPT', ''),
+        *versions,
+    ))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class VersionBumpMixin:
+    """Меняет версии `invalidates_versions` после успешной записи."""
+    invalidates_versions = ()
+
+    def get_invalidated_versions(self):
+        return self.invalidates_versions
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (request.method not in SAFE_METHODS
+                and status.is_success(response.status_code)):
+            bump_versions_on_commit(*self.get_invalidated_versions())
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ConditionalGetMixin(VersionBumpMixin):
+    """
+    Сильные ETag из меток версий `cache_versions`.
+
+    Метка считается до аутентификации и запроса к БД, поэтому
+    совпавший If-None-Match сразу получает 304. Вьюхи одного
+    объекта или вложенного списка переопределяют
+    get_cache_versions и берут метку родителя (`title:42`), чтобы
+    запись в соседние объекты не меняла их ETag.
+    """
+    cache_versions = ()
+
+    def get_cache_versions(self):
+        return self.cache_versions
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        signature = request_signature(
+            request, get_versions(self.get_cache_versions())
+        )
+        etag = f'"{signature}"'
+        if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        # `*` не проверяем: до вызова вьюхи неизвестно, есть ли ресурс.
+        if etag in if_none_match:
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+        response = self.versioned_dispatch(
+            request, signature, *args, **kwargs
+        )
+        if response.status_code == 200:
+            response['ETag'] = etag
+        return response
+
+    def versioned_dispatch(self, request, signature, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+
+class CachedResponseMixin(ConditionalGetMixin):
+    """
+    Кэш готовых ответов на анонимные GET-запросы.
+
+    Ключ включает версии get_cache_versions, поэтому любая запись
+    в эти модели делает старые ответы недостижимыми без TTL.
+    Попадание отдаёт сохранённые байты, не обращаясь к ORM.
+    """
+
+    def is_cacheable(self, request):
+        return (settings.RESPONSE_CACHE_ENABLED
+                and request.method == 'GET'
+                and 'HTTP_AUTHORIZATION' not in request.META)
+
+    def versioned_dispatch(self, request, signature, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return super().versioned_dispatch(
+                request, signature, *args, **kwargs
+            )
+        key = RESPONSE_KEY.format(signature)
+        cached = cache.get(key)
+        if cached is not None:
+            content, headers = cached
+            response = HttpResponse(content)
+            for header, value in headers.items():
+                response[header] = value
+            return response
+        response = super().versioned_dispatch(
+            request, signature, *args, **kwargs
+        )
+        if response.status_code == 200 and hasattr(
+            response, 'add_post_render_callback'
+        ):
+            response.add_post_render_callback(
+                lambda rendered: self.store_response(key, rendered)
+            )
+        return response
+
+    def store_response(self, key, response):
+        renderer = getattr(response, 'accepted_renderer', None)
+        if renderer is None or renderer.format != 'json':
+            return
+        headers = {
+            header: response[header]
+            for header in CACHED_HEADERS if response.has_header(header)
+        }
+        cache.set(
+            key,
+            (response.content, headers),
+            settings.RESPONSE_CACHE_TIMEOUT
+        )
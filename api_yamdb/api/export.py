@@ -0,0 +1,94 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from reviews.models import Comment, Review, Title
+
+CHUNK_SIZE = 2000
+
+# Модель, условие отбора (без помеченных удалёнными произведений)
+# и колонки выгрузки: имя в ответе -> путь для values().
+EXPORTS = {
+    'titles': (Title, {'is_deleted': False}, {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'description': 'description',
+        'category': 'category__slug',
+        'rating': 'rating',
+        'review_count': 'review_count',
+    }),
+    'reviews': (Review, {'title__is_deleted': False}, {
+        'id': 'id',
+        'title_id': 'title_id',
+        'author': 'author__username',
+        'text': 'text',
+        'score': 'score',
+        'pub_date': 'pub_date',
+    }),
+    'comments': (Comment, {'review__title__is_deleted': False}, {
+        'id': 'id',
+        'review_id': 'review_id',
+        'author': 'author__username',
+        'text': 'text',
+        'pub_date': 'pub_date',
+    }),
+}
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class Echo:
+    """Файлоподобный объект для csv.writer, возвращающий строку."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(name):
+    """Строки выгрузки порциями по CHUNK_SIZE, без кэша QuerySet."""
+    model, filters, columns = EXPORTS[name]
+    rows = (
+        model.objects.filter(**filters).order_by('id')
+        .values_list(*columns.values())
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    return tuple(columns), rows
+
+
+def batched(lines):
+    """Склеивает строки в крупные куски, чтобы не писать по строке."""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= CHUNK_SIZE:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def stream_ndjson(name):
+    columns, rows = export_rows(name)
+    return batched(
+        json.dumps(
+            dict(zip(columns, row)), cls=DjangoJSONEncoder, ensure_ascii=False
+        ) + '\n'
+        for row in rows
+    )
+
+
+def stream_csv(name):
+    columns, rows = export_rows(name)
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    yield from batched(writer.writerow(row) for row in rows)
+
+
+STREAMS = {
+    'ndjson': stream_ndjson,
+    'csv': stream_csv,
+}
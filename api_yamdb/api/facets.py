@@ -0,0 +1,49 @@
+from django.db.models import Count, F
+
+from api.snapshot import categories, genres
+from reviews.models import Title, TitleGenre
+
+FACETS_KEY = 'facets:{}'
+DECADE = 10
+
+
+def grouped_counts(queryset, field):
+    """{значение поля: число строк} одним GROUP BY."""
+    return dict(
+        queryset.values(field)
+        .annotate(count=Count('id'))
+        .order_by()
+        .values_list(field, 'count')
+    )
+
+
+def with_counts(snapshot, counts):
+    return [
+        dict(data, count=counts[pk])
+        for pk, data in snapshot.ordered(counts)
+    ]
+
+
+def title_facets(queryset):
+    """
+    Число произведений выборки по жанрам, категориям и десятилетиям.
+
+    По одному сгруппированному запросу на фасет; выборка входит
+    в них подзапросом, названия берутся из снимков справочников.
+    """
+    titles = Title.objects.filter(pk__in=queryset.order_by().values('pk'))
+    decades = grouped_counts(
+        titles.annotate(decade=F('year') / DECADE * DECADE), 'decade'
+    )
+    return {
+        'genre': with_counts(genres.load(), grouped_counts(
+            TitleGenre.objects.filter(title__in=titles), 'genre_id'
+        )),
+        'category': with_counts(
+            categories.load(), grouped_counts(titles, 'category_id')
+        ),
+        'decade': [
+            {'decade': decade, 'count': count}
+            for decade, count in sorted(decades.items())
+        ],
+    }
@@ -0,0 +1,83 @@
+from rest_framework.relations import (
+    MANY_RELATION_KWARGS,
+    ManyRelatedField,
+    SlugRelatedField
+)
+
+
+class BatchedManyRelatedField(ManyRelatedField):
+    """Список связей, который дочернее поле разрешает одним запросом."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.to_internal_value_many(data)
+
+
+class BatchedSlugRelatedField(SlugRelatedField):
+    """
+    SlugRelatedField, который с many=True ищет все slug одним IN.
+
+    Обычный SlugRelatedField делает по запросу на каждый элемент.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchedManyRelatedField(**list_kwargs)
+
+    def to_internal_value_many(self, data):
+        slugs = []
+        for item in data:
+            if not isinstance(item, (str, int)):
+                self.fail('invalid')
+            if str(item) not in slugs:
+                slugs.append(str(item))
+        found = {
+            getattr(obj, self.slug_field): obj
+            for obj in self.get_queryset().filter(
+                **{f'{self.slug_field}__in': slugs}
+            )
+        }
+        for slug in slugs:
+            if slug not in found:
+                self.fail(
+                    'does_not_exist', slug_name=self.slug_field, value=slug
+                )
+        return [found[slug] for slug in slugs]
+
+
+class SnapshotSlugRelatedField(BatchedSlugRelatedField):
+    """
+    Slug-поле справочника, которое разрешается по снимку в памяти.
+
+    snapshot — объект api.snapshot.Snapshot; запросов к БД нет.
+    """
+
+    def __init__(self, snapshot, **kwargs):
+        self.snapshot = snapshot
+        kwargs.setdefault('slug_field', 'slug')
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        return self.to_internal_value_many([data])[0]
+
+    def to_internal_value_many(self, data):
+        snapshot = self.snapshot.load()
+        result = []
+        for item in data:
+            if not isinstance(item, (str, int)):
+                self.fail('invalid')
+            instance = snapshot.instance(str(item))
+            if instance is None:
+                self.fail(
+                    'does_not_exist', slug_name=self.slug_field, value=item
+                )
+            if instance.pk not in {obj.pk for obj in result}:
+                result.append(instance)
+        return result
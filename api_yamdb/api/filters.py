@@ -1,16 +1,82 @@
 import django_filters
+from django.db.models import Count
 
-from reviews.models import Title
+from api.snapshot import categories, genres
+from reviews.models import Title, TitleGenre
+from reviews.search import filter_name, search_titles
+
+GENRE_MATCH_CHOICES = (
+    ('any', 'Любой из жанров'),
+    ('all', 'Все жанры'),
+)
+
+
+def split_slugs(value):
+    """Список slug из строки через запятую, без пустых и повторов."""
+    return list(dict.fromkeys(
+        slug.strip() for slug in value.split(',') if slug.strip()
+    ))
 
 
 class TitleFilter(django_filters.FilterSet):
-    name = django_filters.CharFilter(
-        field_name='name',
-        lookup_expr='icontains'
+    name = django_filters.CharFilter(method='filter_name')
+    genre = django_filters.CharFilter(method='filter_genre')
+    genre_match = django_filters.ChoiceFilter(
+        choices=GENRE_MATCH_CHOICES, method='filter_genre_match'
     )
-    genre = django_filters.CharFilter(field_name='genre__slug')
-    category = django_filters.CharFilter(field_name='category__slug')
+    category = django_filters.CharFilter(method='filter_category')
+    year_min = django_filters.NumberFilter(
+        field_name='year', lookup_expr='gte'
+    )
+    year_max = django_filters.NumberFilter(
+        field_name='year', lookup_expr='lte'
+    )
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         fields = ('name', 'category', 'genre', 'year')
+
+    def filter_name(self, queryset, name, value):
+        """Подстрока в названии без учёта регистра (через FTS5)."""
+        return filter_name(queryset, value)
+
+    def filter_genre(self, queryset, name, value):
+        """
+        Жанры через запятую: любой из них (any) или все сразу (all).
+
+        slug переводятся в id по снимку; произведения отбираются
+        подзапросом к TitleGenre по индексу (genre, title), без JOIN
+        и DISTINCT.
+        """
+        by_slug = genres.load().by_slug
+        slugs = split_slugs(value)
+        ids = [by_slug[slug] for slug in slugs if slug in by_slug]
+        match = self.form.cleaned_data.get('genre_match') or 'any'
+        if not ids or (match == 'all' and len(ids) < len(slugs)):
+            return queryset.none()
+        links = TitleGenre.objects.filter(genre_id__in=ids).order_by()
+        if match == 'all':
+            # Связи уникальны, поэтому число строк равно числу жанров.
+            links = (
+                links.values('title_id')
+                .annotate(matched=Count('genre_id'))
+                .filter(matched=len(ids))
+            )
+        return queryset.filter(id__in=links.values('title_id'))
+
+    def filter_genre_match(self, queryset, name, value):
+        # Учитывается в filter_genre.
+        return queryset
+
+    def filter_category(self, queryset, name, value):
+        """Категории через запятую."""
+        by_slug = categories.load().by_slug
+        ids = [by_slug[slug] for slug in split_slugs(value) if slug in by_slug]
+        if not ids:
+            return queryset.none()
+        return queryset.filter(category_id__in=ids)
+
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск по названию и описанию."""
+        return search_titles(queryset, value)
@@ -0,0 +1,137 @@
+import heapq
+import json
+from contextlib import ExitStack, contextmanager
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+DETAIL_HEADER = 'HTTP_X_SERVER_TIMING_DETAIL'
+SQL_PREVIEW_LENGTH = 300
+# Этапы вьюхи, которые пишут своё время в request.server_timing.
+PHASES = (
+    ('auth', 'authentication without db'),
+    ('permissions', 'permission checks without db'),
+    ('serialize', 'serializer.data without db'),
+)
+
+
+class QueryTimer:
+    """execute_wrapper, считающий запросы, их время и самые медленные."""
+
+    def __init__(self, keep):
+        self.count = 0
+        self.duration = 0.0
+        self.keep = keep
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            item = (duration, self.count, sql)
+            if len(self.slowest) < self.keep:
+                heapq.heappush(self.slowest, item)
+            else:
+                heapq.heappushpop(self.slowest, item)
+
+
+@contextmanager
+def server_timing(request, name):
+    """
+    Добавляет время блока без запросов к БД в метрику `name`.
+
+    Без ServerTimingMiddleware (или без запроса) ничего не делает.
+    """
+    timer = getattr(request, 'query_timer', None)
+    if timer is None:
+        yield
+        return
+    started, db_started = perf_counter(), timer.duration
+    try:
+        yield
+    finally:
+        duration = (perf_counter() - started) - (timer.duration - db_started)
+        timing = request.server_timing
+        timing[name] = timing.get(name, 0.0) + duration
+
+
+class ServerTimingMiddleware:
+    """
+    Заголовок Server-Timing: время БД, кода вьюхи и рендеринга.
+
+    Аутентификация, проверка прав и serializer.data идут отдельными
+    метриками (см. server_timing), в `app` остаётся прочий код вьюхи.
+
+    При SERVER_TIMING_ENABLED = False middleware отключается
+    целиком и не добавляет накладных расходов. Администратор с
+    заголовком `X-Server-Timing-Detail` получает также список
+    самых медленных запросов в `Server-Timing-Detail`.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer(settings.SERVER_TIMING_SLOW_QUERIES)
+        request.server_timing = {}
+        request.query_timer = timer
+        started = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        total = perf_counter() - started
+        self.add_headers(request, response, timer, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.server_timing['view_started'] = perf_counter()
+
+    def process_template_response(self, request, response):
+        timing = request.server_timing
+        timing['view'] = perf_counter() - timing.pop(
+            'view_started', perf_counter()
+        )
+        started = perf_counter()
+        response.render()
+        timing['render'] = perf_counter() - started
+        return response
+
+    def add_headers(self, request, response, timer, total):
+        timing = request.server_timing
+        metrics = [('db', timer.duration, f'{timer.count} queries')]
+        if 'view' in timing:
+            phases = [
+                (name, timing[name], description)
+                for name, description in PHASES if name in timing
+            ]
+            app = timing['view'] - timer.duration - sum(
+                duration for _, duration, _ in phases
+            )
+            metrics.extend(phases)
+            metrics.append(('app', max(app, 0), 'view code without db'))
+            metrics.append(('render', timing['render'], 'rendering'))
+        metrics.append(('total', total, 'request'))
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={duration * 1000:.2f};desc="{description}"'
+            for name, duration, description in metrics
+        )
+        user = getattr(request, 'user', None)
+        if (DETAIL_HEADER in request.META
+                and getattr(user, 'is_authenticated', False)
+                and user.is_admin):
+            response['Server-Timing-Detail'] = json.dumps([
+                {
+                    'ms': round(duration * 1000, 3),
+                    'sql': sql[:SQL_PREVIEW_LENGTH],
+                }
+                for duration, _, sql in sorted(timer.slowest, reverse=True)
+            ])
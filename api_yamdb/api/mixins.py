@@ -0,0 +1,134 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from api.middleware import server_timing
+
+
+def get_model_relation(model, field):
+    """Поле связи модели, которое читает поле сериализатора, или None."""
+    if field.write_only or field.source == '*':
+        return None
+    try:
+        model_field = model._meta.get_field(field.source.split('.')[0])
+    except FieldDoesNotExist:
+        return None
+    return model_field if model_field.is_relation else None
+
+
+def collect_relations(serializer, prefix='', prefetch_only=False):
+    """
+    Обходит поля сериализатора и собирает связи, которые он читает.
+
+    Возвращает пары множеств путей для select_related и
+    prefetch_related. Всё, что вложено в prefetch, тоже
+    подгружается через prefetch_related.
+    """
+    select, prefetch = set(), set()
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is None:
+        return select, prefetch
+    for field in serializer.fields.values():
+        model_field = get_model_relation(model, field)
+        if model_field is None:
+            continue
+        path = prefix + model_field.name
+        many = model_field.many_to_many or model_field.one_to_many
+        if isinstance(field, ListSerializer):
+            field, many = field.child, True
+        if isinstance(field, ManyRelatedField):
+            field, many = field.child_relation, True
+        if isinstance(field, PrimaryKeyRelatedField) and not many:
+            # Хватает значения внешнего ключа на самой строке.
+            continue
+        if many or prefetch_only:
+            prefetch.add(path)
+        else:
+            select.add(path)
+        if isinstance(field, BaseSerializer):
+            nested_select, nested_prefetch = collect_relations(
+                field, f'{path}__', prefetch_only or many
+            )
+            select |= nested_select
+            prefetch |= nested_prefetch
+    return select, prefetch
+
+
+@lru_cache(maxsize=None)
+def serializer_relations(serializer_class):
+    select, prefetch = collect_relations(serializer_class())
+    return tuple(sorted(select)), tuple(sorted(prefetch))
+
+
+class QuerysetOptimizerMixin:
+    """
+    Добавляет select_related/prefetch_related по полям сериализатора.
+
+    Число запросов на страницу не зависит от её размера; новые
+    вложенные сериализаторы учитываются без правки вьюсета.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        select, prefetch = serializer_relations(self.get_serializer_class())
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+
+class SoftDeleteMixin:
+    """
+    DELETE только помечает запись удалённой (is_deleted).
+
+    Запись сразу пропадает из выдачи, а зависимые строки
+    пачками обрабатывает команда purge_deleted.
+    """
+
+    def perform_destroy(self, instance):
+        instance.is_deleted = True
+        instance.save(update_fields=('is_deleted',))
+
+
+class ServerTimingMixin:
+    """Пишет аутентификацию и проверку прав в отдельные метрики."""
+
+    def perform_authentication(self, request):
+        with server_timing(request, 'auth'):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        with server_timing(request, 'permissions'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with server_timing(request, 'permissions'):
+            super().check_object_permissions(request, obj)
+
+
+class TimedListSerializer(ListSerializer):
+
+    @property
+    def data(self):
+        with server_timing(self.context.get('request'), 'serialize'):
+            return super().data
+
+
+class ServerTimingSerializerMixin:
+    """Пишет serializer.data в метрику serialize, в том числе для many."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        serializer = super().many_init(*args, **kwargs)
+        # Свой list_serializer_class в Meta не трогаем.
+        if type(serializer) is ListSerializer:
+            serializer.__class__ = TimedListSerializer
+        return serializer
+
+    @property
+    def data(self):
+        with server_timing(self.context.get('request'), 'serialize'):
+            return super().data
@@ -0,0 +1,157 @@
+import json
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    CursorPagination,
+    LimitOffsetPagination,
+    _reverse_ordering
+)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Пагинация по ключу сортировки без OFFSET и COUNT(*).
+
+    Порядок берётся из атрибута `cursor_ordering` вьюсета и должен
+    заканчиваться уникальным полем. В курсоре хранятся значения всех
+    полей порядка, а не только первого, как у CursorPagination, поэтому
+    одинаковые name или pub_date не листаются через OFFSET: страница
+    читается диапазоном индекса с того же места, что и первая.
+    """
+    page_size = settings.PAGE_SIZE
+    page_size_query_param = 'limit'
+    max_page_size = settings.MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        return view.cursor_ordering
+
+    def decode_cursor(self, request):
+        # Пустой `?cursor=` включает режим курсоров с первой страницы.
+        if not request.query_params.get(self.cursor_query_param):
+            return None
+        cursor = super().decode_cursor(request)
+        if cursor.position is None:
+            return cursor
+        try:
+            position = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor._replace(position=position)
+
+    def encode_cursor(self, cursor):
+        if cursor.position is not None:
+            cursor = cursor._replace(position=json.dumps(cursor.position))
+        return super().encode_cursor(cursor)
+
+    def _get_position_from_instance(self, instance, ordering):
+        return [
+            str(getattr(instance, order.lstrip('-'))) for order in ordering
+        ]
+
+    def after(self, position, reverse):
+        """
+        Строки после позиции в порядке сортировки.
+
+        (a, b) > (x, y) записывается как a >= x AND (a > x OR b > y):
+        первое условие задаёт начало диапазона индекса.
+        """
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        clauses, equal = [], Q()
+        for order, value in zip(self.ordering, position):
+            field = order.lstrip('-')
+            lookup = 'lt' if reverse != order.startswith('-') else 'gt'
+            clauses.append(equal & Q(**{f'{field}__{lookup}': value}))
+            equal &= Q(**{field: value})
+        first = self.ordering[0]
+        lookup = 'lte' if reverse != first.startswith('-') else 'gte'
+        return (
+            Q(**{f'{first.lstrip("-")}__{lookup}': position[0]})
+            & reduce(or_, clauses)
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Повторяет CursorPagination.paginate_queryset, но фильтрует
+        # по всей позиции. Позиции уникальны, поэтому смещение в курсоре
+        # всегда 0.
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self.after(current_position, reverse))
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            following_position = None
+        has_following = following_position is not None
+        has_position = current_position is not None or offset > 0
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = has_position, has_following
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next, self.has_previous = has_following, has_position
+            self.next_position = following_position
+            self.previous_position = current_position
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+
+class LimitOffsetOrKeysetPagination(LimitOffsetPagination):
+    """
+    LimitOffset по умолчанию, курсоры — по запросу клиента.
+
+    Параметр `cursor` в запросе к вьюсету с `cursor_ordering`
+    переключает пагинацию на KeysetPagination.
+    """
+    keyset_class = KeysetPagination
+
+    def __init__(self):
+        self.keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (getattr(view, 'cursor_ordering', None)
+                and self.keyset_class.cursor_query_param
+                in request.query_params):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.keyset:
+            return self.keyset.get_html_context()
+        return super().get_html_context()
+
+    def to_html(self):
+        if self.keyset:
+            return self.keyset.to_html()
+        return super().to_html()
@@ -9,22 +9,33 @@ from rest_framework.serializers import (
     ValidationError
 )
 
+from api.fields import SnapshotSlugRelatedField
+from api.mixins import ServerTimingSerializerMixin
+from api.snapshot import categories, genres
 from reviews.models import (
     Category,
     Comment,
     Genre,
     Review,
     Title,
+    TitleGenre,
 )
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(ServerTimingSerializerMixin,
+                         serializers.ModelSerializer):
     """Сериализатор для CategoryViewSet"""
 
     class Meta:
         model = Category
         fields = ('name', 'slug')
 
+    def validate_slug(self, value):
+        """slug занят только среди неудалённых записей."""
+        if Category.objects.filter(slug=value, is_deleted=False).exists():
+            raise ValidationError('Категория с таким slug уже существует.')
+        return value
+
     def validate(self, data):
         name = data.get('name')
         slug = data.get('slug')
@@ -36,13 +47,20 @@ class CategorySerializer(serializers.ModelSerializer):
         return data
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(ServerTimingSerializerMixin,
+                      serializers.ModelSerializer):
     """Сериализатор для GenreViewSet"""
 
     class Meta:
         model = Genre
         fields = ('name', 'slug')
 
+    def validate_slug(self, value):
+        """slug занят только среди неудалённых записей."""
+        if Genre.objects.filter(slug=value, is_deleted=False).exists():
+            raise ValidationError('Жанр с таким slug уже существует.')
+        return value
+
     def validate(self, data):
         name = data.get('name')
         slug = data.get('slug')
@@ -54,11 +72,20 @@ class GenreSerializer(serializers.ModelSerializer):
         return data
 
 
-class TitleGetSerializer(serializers.ModelSerializer):
-    """Сериализатор для TitleViewSet"""
-    genre = GenreSerializer(read_only=True, many=True)
-    category = CategorySerializer()
+class TitleGetSerializer(ServerTimingSerializerMixin,
+                         serializers.ModelSerializer):
+    """
+    Сериализатор для TitleViewSet.
+
+    Жанры и категория берутся из снимков справочников в памяти
+    (api.snapshot): queryset должен подгружать titlegenre_set.
+    Гистограмма и медиана оценок выводятся только с `?histogram=true`.
+    """
+    genre = serializers.SerializerMethodField()
+    category = serializers.SerializerMethodField()
     rating = serializers.SerializerMethodField()
+    score_histogram = serializers.SerializerMethodField()
+    score_median = serializers.SerializerMethodField()
 
     class Meta:
         fields = (
@@ -68,21 +95,54 @@ class TitleGetSerializer(serializers.ModelSerializer):
             'rating',
             'description',
             'genre',
-            'category'
+            'category',
+            'score_histogram',
+            'score_median'
         )
         model = Title
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.query_params.get(
+            'histogram'
+        ) not in ('1', 'true'):
+            self.fields.pop('score_histogram')
+            self.fields.pop('score_median')
+
     def get_rating(self, obj):
         return obj.rating
 
+    def get_score_histogram(self, obj):
+        return obj.score_histogram()
+
+    def get_score_median(self, obj):
+        return obj.score_median()
+
+    def get_genre(self, obj):
+        return self.snapshot(genres).data_many(
+            link.genre_id for link in obj.titlegenre_set.all()
+        )
+
+    def get_category(self, obj):
+        return self.snapshot(categories).data(obj.category_id)
+
+    def snapshot(self, source):
+        """Снимок проверяется один раз на весь список."""
+        key = f'snapshot:{source.version}'
+        if key not in self.context:
+            self.context[key] = source.load()
+        return self.context[key]
+
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(ServerTimingSerializerMixin,
+                      serializers.ModelSerializer):
     """Сериализатор для TitleViewSet"""
-    genre = serializers.SlugRelatedField(
-        slug_field='slug', many=True, queryset=Genre.objects.all()
+    genre = SnapshotSlugRelatedField(
+        snapshot=genres, many=True, queryset=Genre.objects.all()
     )
-    category = serializers.SlugRelatedField(
-        slug_field='slug', queryset=Category.objects.all()
+    category = SnapshotSlugRelatedField(
+        snapshot=categories, queryset=Category.objects.all()
     )
 
     class Meta:
@@ -109,8 +169,42 @@ class TitleSerializer(serializers.ModelSerializer):
                 raise ValidationError('Не указано поле category')
         return data
 
+    def create(self, validated_data):
+        genres = validated_data.pop('genre', [])
+        title = Title.objects.create(**validated_data)
+        self.write_genres(title, genres, existing=set())
+        return title
+
+    def update(self, instance, validated_data):
+        """
+        Пишет только переданные поля: агрегаты отзывов и is_deleted
+        меняются параллельно и не должны перезаписываться значениями,
+        прочитанными в начале запроса.
+        """
+        genres = validated_data.pop('genre', None)
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        if validated_data:
+            instance.save(update_fields=validated_data)
+        if genres is not None:
+            self.write_genres(instance, genres)
+        return instance
+
+    def write_genres(self, title, genres, existing=None):
+        """Связи с жанрами: один DELETE лишних и один bulk_create новых."""
+        ids = {genre.id for genre in genres}
+        links = TitleGenre.objects.filter(title=title)
+        if existing is None:
+            existing = set(links.values_list('genre_id', flat=True))
+        if existing - ids:
+            links.filter(genre_id__in=existing - ids).delete()
+        TitleGenre.objects.bulk_create(
+            TitleGenre(title=title, genre=genre)
+            for genre in genres if genre.id not in existing
+        )
+
 
-class ReviewSerializer(ModelSerializer):
+class ReviewSerializer(ServerTimingSerializerMixin, ModelSerializer):
     """Сериалайзер модели Review."""
     author = SlugRelatedField(
         slug_field='username',
@@ -144,7 +238,7 @@ class ReviewSerializer(ModelSerializer):
         return data
 
 
-class CommentSerializer(ModelSerializer):
+class CommentSerializer(ServerTimingSerializerMixin, ModelSerializer):
     """Сериалайзер модели Comment."""
     author = SlugRelatedField(
         slug_field='username',
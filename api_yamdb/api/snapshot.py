@@ -0,0 +1,87 @@
+from threading import Lock
+
+from api.cache import get_versions
+from reviews.models import Category, Genre
+
+
+class Snapshot:
+    """
+    Копия маленькой справочной таблицы в памяти процесса.
+
+    Перечитывается целиком, когда меняется метка версии модели
+    (см. api.cache); проверка метки — одно обращение к кэшу.
+    Словари по id и по slug заменяются одной парой `maps`, поэтому
+    читатель без блокировки не увидит их из разных версий.
+    """
+
+    def __init__(self, model, version):
+        self.model = model
+        self.version = version
+        self.lock = Lock()
+        self.stamp = None
+        self.maps = ({}, {})
+
+    def __deepcopy__(self, memo):
+        # Поля сериализаторов копируются вместе с аргументами,
+        # а снимок должен оставаться общим на процесс.
+        return self
+
+    def load(self):
+        """Актуальный снимок; перечитывает таблицу при смене версии."""
+        # Метку читаем до таблицы: если запись успеет между ними,
+        # снимок сохранится под старой меткой и перечитается.
+        stamp, = get_versions((self.version,))
+        if stamp != self.stamp:
+            with self.lock:
+                if stamp != self.stamp:
+                    self.refresh(stamp)
+        return self
+
+    def refresh(self, stamp):
+        rows = self.model.objects.filter(is_deleted=False).values_list(
+            'id', 'name', 'slug'
+        )
+        by_id = {
+            pk: (position, {'name': name, 'slug': slug})
+            for position, (pk, name, slug) in enumerate(rows)
+        }
+        by_slug = {data['slug']: pk for pk, (_, data) in by_id.items()}
+        self.maps = (by_id, by_slug)
+        self.stamp = stamp
+
+    @property
+    def by_id(self):
+        return self.maps[0]
+
+    @property
+    def by_slug(self):
+        return self.maps[1]
+
+    def data(self, pk):
+        """{'name': ..., 'slug': ...} по id или None."""
+        item = self.maps[0].get(pk)
+        return None if item is None else dict(item[1])
+
+    def ordered(self, pks):
+        """Пары (id, данные) для известных id в порядке сортировки модели."""
+        by_id = self.maps[0]
+        items = sorted(
+            (by_id[pk][0], pk) for pk in set(pks) if pk in by_id
+        )
+        return [(pk, dict(by_id[pk][1])) for _, pk in items]
+
+    def data_many(self, pks):
+        """Данные по списку id в порядке сортировки модели."""
+        return [data for _, data in self.ordered(pks)]
+
+    def instance(self, slug):
+        """Несохраняемый экземпляр модели по slug или None."""
+        by_id, by_slug = self.maps
+        pk = by_slug.get(slug)
+        if pk is None:
+            return None
+        return self.model(id=pk, **by_id[pk][1])
+
+
+genres = Snapshot(Genre, 'genre')
+categories = Snapshot(Category, 'category')
@@ -6,6 +6,7 @@ from api.views import (
     TitleViewSet,
     GenreViewSet,
     CategoryViewSet,
+    ExportView,
     ReviewViewSet
 )
 from users.views import UserViewSet
@@ -30,5 +31,6 @@ v1_router.register(
 
 urlpatterns = [
     path('v1/', include('users.urls')),
+    path('v1/export/<str:name>/', ExportView.as_view(), name='export'),
     path('v1/', include(v1_router.urls))
 ]
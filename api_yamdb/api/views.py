@@ -1,18 +1,44 @@
-from django.db.models import Avg
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models.query import QuerySet
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import filters
 from rest_framework import mixins
+from rest_framework import status
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import (
+    SAFE_METHODS,
     IsAuthenticatedOrReadOnly,
     BasePermission
 )
+from rest_framework.response import Response
 from rest_framework.serializers import ModelSerializer
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
+from api.autocomplete import title_index
+from api.cache import (
+    BULK_VERSION,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    bump_versions_on_commit,
+    get_versions,
+    object_version,
+    request_signature
+)
+from api.export import CONTENT_TYPES, EXPORTS, STREAMS
+from api.facets import FACETS_KEY, title_facets
+from api.mixins import (
+    QuerysetOptimizerMixin,
+    ServerTimingMixin,
+    SoftDeleteMixin
+)
+from api.snapshot import categories, genres
 from api.module_var import get_review_id, get_title_id
 from api.serializers import (
     CategorySerializer,
@@ -22,16 +48,19 @@ from api.serializers import (
     TitleGetSerializer,
     TitleSerializer,
 )
-from reviews.models import Category, Genre, Review, Title
+from reviews.models import Category, Genre, Review, Title, TitleGenre
 
 from .filters import TitleFilter
 from .permissions import (
+    IsAdmin,
     IsAdminOrSuperuser,
     IsAuthorModeratorAdminOrReadOnly
 )
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ServerTimingMixin, QuerysetOptimizerMixin,
+                   SoftDeleteMixin, CachedResponseMixin,
+                   viewsets.ModelViewSet):
     """
     Произведения, к которым пишут отзывы
     (определённый фильм, книга или песенка).
@@ -46,30 +75,147 @@ class TitleViewSet(viewsets.ModelViewSet):
         PATCH: /titles/{titles_id}/
     Удалить произведение: Администратор.
         DELETE: /titles/{titles_id}/
+    Количество произведений по жанрам, категориям и десятилетиям
+    с теми же фильтрами, что у списка: Доступно без токена
+        GET: /titles/facets/
+    Подсказки по началу слова названия: Доступно без токена
+        GET: /titles/autocomplete/?q=
+    Лучшие по рейтингу (в целом, в категории или жанре) и самые
+    обсуждаемые за последние дни: Доступно без токена
+        GET: /titles/top/?category=&genre=
+        GET: /titles/trending/
     """
 
-    queryset = Title.objects.all()
+    queryset = Title.objects.filter(is_deleted=False)
     serializer_class = TitleSerializer
+    cursor_ordering = ('name', 'id')
+    cache_versions = ('title', 'genre', 'category', 'review')
+    invalidates_versions = ('title',)
     http_method_names = ('get', 'post', 'patch', 'delete')
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     permission_classes = (IsAuthenticatedOrReadOnly,)
 
-    def get_queryset(self) -> QuerySet:
-        return super().get_queryset().annotate(rating=Avg('reviews__score'))
-
     def get_permissions(self) -> BasePermission:
         if self.request.method in ['POST', 'DELETE', 'PUT', 'PATCH']:
             return (IsAdminOrSuperuser(),)
         return super().get_permissions()
 
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+        if self.request.method == 'GET':
+            # Жанры TitleGetSerializer берёт из снимка, нужны только id.
+            queryset = queryset.prefetch_related('titlegenre_set')
+        return queryset
+
     def get_serializer_class(self) -> ModelSerializer:
         if self.request.method == 'GET':
             return TitleGetSerializer
         return self.serializer_class
 
+    def get_cache_versions(self) -> tuple:
+        if 'pk' not in self.kwargs:
+            return self.cache_versions
+        # Карточка меняется только со своим произведением (в том числе
+        # с его отзывами) и справочниками, а не с любым произведением.
+        return (
+            'genre', 'category', BULK_VERSION,
+            object_version('title', self.kwargs['pk'])
+        )
+
+    def get_invalidated_versions(self) -> tuple:
+        versions = super().get_invalidated_versions()
+        if 'pk' in self.kwargs:
+            versions += (object_version('title', self.kwargs['pk']),)
+        return versions
+
+    def perform_destroy(self, instance: Title) -> None:
+        super().perform_destroy(instance)
+        # Ветки комментариев удалённого произведения теперь отдают 404.
+        bump_versions_on_commit(*(
+            object_version('review', pk)
+            for pk in instance.reviews.values_list('id', flat=True)
+        ))
+
+    @action(detail=False)
+    def facets(self, request):
+        # Счётчики не зависят от пользователя: кэшируются для всех
+        # по фильтрам и версиям моделей.
+        key = FACETS_KEY.format(request_signature(
+            request, get_versions(self.get_cache_versions())
+        ))
+        data = cache.get(key)
+        if data is None:
+            data = title_facets(self.filter_queryset(self.get_queryset()))
+            cache.set(key, data, settings.RESPONSE_CACHE_TIMEOUT)
+        return Response(data)
+
+    @action(detail=False)
+    def autocomplete(self, request):
+        return Response(title_index.load().search(
+            request.query_params.get('q', ''), self.get_limit()
+        ))
+
+    @action(detail=False)
+    def top(self, request):
+        queryset = self.get_queryset().filter(rating__isnull=False)
+        # Для неизвестного slug id 0 не совпадёт ни с одной строкой.
+        category = request.query_params.get('category')
+        if category:
+            queryset = queryset.filter(
+                category_id=categories.load().by_slug.get(category, 0)
+            )
+        genre = request.query_params.get('genre')
+        if genre:
+            queryset = queryset.filter(id__in=TitleGenre.objects.filter(
+                genre_id=genres.load().by_slug.get(genre, 0)
+            ).values('title_id'))
+        return self.ranking(queryset.order_by('-rating', 'id'))
+
+    @action(detail=False)
+    def trending(self, request):
+        return self.ranking(
+            self.get_queryset().filter(trending__gt=0)
+            .order_by('-trending', 'id')
+        )
+
+    def ranking(self, queryset):
+        # Первые limit строк диапазона индекса, без подсчёта всех.
+        serializer = self.get_serializer(
+            queryset[:self.get_limit()], many=True
+        )
+        return Response(serializer.data)
+
+    def get_limit(self) -> int:
+        try:
+            limit = int(self.request.query_params.get('limit', ''))
+        except ValueError:
+            limit = settings.PAGE_SIZE
+        return min(max(limit, 1), settings.MAX_PAGE_SIZE)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method in SAFE_METHODS or not status.is_success(
+            response.status_code
+        ):
+            return super().finalize_response(
+                request, response, *args, **kwargs
+            )
+        # Метки до и после записи: индекс подсказок принимает точечное
+        # обновление, только если между ними не было чужих записей.
+        before, = get_versions(('title',))
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        after, = get_versions(('title',))
+        pk = self.kwargs.get('pk') or response.data.get('id')
+        transaction.on_commit(
+            lambda: title_index.update(int(pk), before, after)
+        )
+        return response
+
 
 class ListCreateDeleteViewSet(
+    ServerTimingMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -79,7 +225,8 @@ class ListCreateDeleteViewSet(
     pass
 
 
-class GenreViewSet(ListCreateDeleteViewSet):
+class GenreViewSet(SoftDeleteMixin, CachedResponseMixin,
+                   ListCreateDeleteViewSet):
     """
     Категории жанров.
 
@@ -91,8 +238,10 @@ class GenreViewSet(ListCreateDeleteViewSet):
         DELETE: /genres/{slug}/
     """
 
-    queryset = Genre.objects.all()
+    queryset = Genre.objects.filter(is_deleted=False)
     serializer_class = GenreSerializer
+    cache_versions = ('genre',)
+    invalidates_versions = ('genre',)
     lookup_field = 'slug'
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
@@ -104,7 +253,8 @@ class GenreViewSet(ListCreateDeleteViewSet):
         return super().get_permissions()
 
 
-class CategoryViewSet(ListCreateDeleteViewSet):
+class CategoryViewSet(SoftDeleteMixin, CachedResponseMixin,
+                      ListCreateDeleteViewSet):
     """
     Категории (типы) произведений.
 
@@ -115,9 +265,11 @@ class CategoryViewSet(ListCreateDeleteViewSet):
     Удалить категорию: Администратор.
         DELETE: /categories/{slug}/
     """
-    queryset = Category.objects.all()
+    queryset = Category.objects.filter(is_deleted=False)
     lookup_field = 'slug'
     serializer_class = CategorySerializer
+    cache_versions = ('category',)
+    invalidates_versions = ('category',)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     permission_classes = (IsAuthenticatedOrReadOnly,)
@@ -128,7 +280,8 @@ class CategoryViewSet(ListCreateDeleteViewSet):
         return super().get_permissions()
 
 
-class ReviewViewSet(ModelViewSet):
+class ReviewViewSet(ServerTimingMixin, QuerysetOptimizerMixin,
+                    ConditionalGetMixin, ModelViewSet):
     """
     Отзывы.
 
@@ -145,22 +298,41 @@ class ReviewViewSet(ModelViewSet):
     """
     serializer_class = ReviewSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
+    cursor_ordering = ('pub_date', 'id')
+    invalidates_versions = ('review',)
     permission_classes = (IsAuthorModeratorAdminOrReadOnly,)
 
+    def get_cache_versions(self) -> tuple:
+        # Метку произведения меняют его отзывы (сигналы reviews),
+        # правка самого произведения и смена username их авторов.
+        return (BULK_VERSION, object_version('title', get_title_id(self)))
+
     def get_queryset(self) -> QuerySet:
         """Возвращает отзывы."""
         title_id = get_title_id(self)
-        title = get_object_or_404(Title, id=title_id)
+        title = get_object_or_404(Title, id=title_id, is_deleted=False)
         return title.reviews.all()
 
+    @transaction.atomic
     def perform_create(self, serializer: ModelSerializer) -> None:
         """Создаёт отзыв в БД."""
         title_id = get_title_id(self)
-        title = get_object_or_404(Title, pk=title_id)
+        title = get_object_or_404(Title, pk=title_id, is_deleted=False)
         serializer.save(author=self.request.user, title=title)
 
+    @transaction.atomic
+    def perform_update(self, serializer: ModelSerializer) -> None:
+        """Обновляет отзыв вместе с рейтингом произведения."""
+        super().perform_update(serializer)
 
-class CommentViewSet(ModelViewSet):
+    @transaction.atomic
+    def perform_destroy(self, instance: Review) -> None:
+        """Удаляет отзыв вместе с его вкладом в рейтинг произведения."""
+        super().perform_destroy(instance)
+
+
+class CommentViewSet(ServerTimingMixin, QuerysetOptimizerMixin,
+                     ConditionalGetMixin, ModelViewSet):
     """
     Комментарии к отзывам
 
@@ -178,18 +350,54 @@ class CommentViewSet(ModelViewSet):
     """
     serializer_class = CommentSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
+    cursor_ordering = ('pub_date', 'id')
     permission_classes = (IsAuthorModeratorAdminOrReadOnly,)
 
+    def get_cache_versions(self) -> tuple:
+        return (BULK_VERSION, object_version('review', get_review_id(self)))
+
+    def get_invalidated_versions(self) -> tuple:
+        return (object_version('review', get_review_id(self)),)
+
     def get_queryset(self) -> QuerySet:
         """Возвращает комментарий."""
         id = get_review_id(self)
         title_id = get_title_id(self)
-        review = get_object_or_404(Review, id=id, title=title_id)
+        review = get_object_or_404(
+            Review, id=id, title=title_id, title__is_deleted=False
+        )
         return review.comments.all()
 
     def perform_create(self, serializer: ModelSerializer) -> None:
         """Создаёт комментарий в БД."""
         id = get_review_id(self)
         title_id = get_title_id(self)
-        review = get_object_or_404(Review, id=id, title=title_id)
+        review = get_object_or_404(
+            Review, id=id, title=title_id, title__is_deleted=False
+        )
         serializer.save(author=self.request.user, review=review)
+
+
+class ExportView(ServerTimingMixin, APIView):
+    """
+    Потоковая выгрузка таблиц для аналитики.
+
+    Выгрузить произведения, отзывы или комментарии: Администратор.
+        GET: /export/{titles|reviews|comments}/?type=ndjson|csv
+    """
+    permission_classes = (IsAdmin,)
+
+    def get(self, request, name):
+        if name not in EXPORTS:
+            raise Http404
+        export_type = request.query_params.get('type', 'ndjson')
+        if export_type not in STREAMS:
+            raise Http404
+        response = StreamingHttpResponse(
+            STREAMS[export_type](name),
+            content_type=CONTENT_TYPES[export_type]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{name}.{export_type}"'
+        )
+        return response
@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -29,6 +30,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -112,23 +114,71 @@ ADMIN = 'admin'
 # constants
 USER_FIELD_LEN = 150
 PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
 CONFIRM_CODE_LEN = 9
 NO_REPLY_MAIL = 'site@example.com'
 
+# cache
+# Метки версий — единственный механизм инвалидации кэша ответов, ETag
+# и снимков справочников, поэтому кэш должен быть общим для всех
+# процессов. Рекомендуется Memcached:
+#   CACHE_BACKEND=django.core.cache.backends.memcached.PyMemcacheCache
+#   CACHE_LOCATION=127.0.0.1:11211
+# Файловый кэш по умолчанию работает без дополнительных сервисов, но
+# каждая запись в нём просматривает весь каталог. LocMemCache не
+# годится при нескольких процессах.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', str(BASE_DIR / 'cache')),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+# подсказки по названиям произведений (индекс в памяти процесса):
+# рейтинги в нём обновляются не реже, чем раз в AUTOCOMPLETE_TTL секунд
+AUTOCOMPLETE_TTL = 5 * 60
+# окно /titles/trending/ в днях; сдвигается командой compact_rankings
+TRENDING_WINDOW_DAYS = 7
+
+# server timing
+SERVER_TIMING_ENABLED = True
+SERVER_TIMING_SLOW_QUERIES = 5
+
 # auth settings
 AUTH_USER_MODEL = 'users.User'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+# очередь писем: 'thread' — фоновый поток процесса, 'inline' — сразу
+# после коммита, 'command' — только `manage.py send_outbox`
+EMAIL_OUTBOX_DELIVERY = 'thread'
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+# пауза перед повтором после неудачи, с; удваивается с каждой попыткой.
+# Отложенные письма досылает следующий вызов очереди или send_outbox
+EMAIL_OUTBOX_RETRY_DELAY = 60
+# через сколько секунд письма упавшего отправителя снова в очереди
+EMAIL_OUTBOX_CLAIM_TIMEOUT = 5 * 60
+# кэш пользователей для JWT-аутентификации (в процессе)
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 30
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.LimitOffsetOrKeysetPagination',
     'PAGE_SIZE': PAGE_SIZE
 }
 
@@ -0,0 +1,140 @@
+from django.db.models import (
+    Avg,
+    Count,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum
+)
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from reviews.models import SCORE_FIELDS, Review, Title
+
+
+def rating_expression(score_sum, review_count):
+    """Рейтинг как отношение суммы оценок к числу отзывов (NULL без них)."""
+    return ExpressionWrapper(
+        Cast(score_sum, FloatField()) / NullIf(review_count, 0),
+        output_field=FloatField()
+    )
+
+
+def histogram_counts(reviews):
+    """
+    Подзапросы числа оценок каждого значения для UPDATE произведений.
+
+    reviews — отзывы, уже отобранные по title_id=OuterRef('pk').
+    """
+    return {
+        name: Coalesce(
+            Subquery(
+                reviews.filter(score=score)
+                .annotate(total=Count('id'))
+                .values('total')
+            ),
+            0,
+            output_field=IntegerField()
+        )
+        for score, name in SCORE_FIELDS.items()
+    }
+
+
+def apply_review_delta(title_id, score_delta, count_delta,
+                       trending_delta=0, histogram=None):
+    """
+    Сдвигает агрегаты произведения одним UPDATE.
+
+    Новые значения считаются в самой БД от текущих, поэтому
+    параллельные отзывы к одному произведению не теряют обновлений.
+    histogram — сдвиг счётчиков гистограммы {оценка: дельта}.
+    """
+    counters = {
+        SCORE_FIELDS[score]: F(SCORE_FIELDS[score]) + delta
+        for score, delta in (histogram or {}).items() if delta
+    }
+    if not (score_delta or count_delta or trending_delta or counters):
+        return
+    score_sum = F('score_sum') + score_delta
+    review_count = F('review_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        score_sum=score_sum,
+        review_count=review_count,
+        rating=rating_expression(score_sum, review_count),
+        trending=F('trending') + trending_delta,
+        **counters
+    )
+
+
+def recalculate_title(title_id):
+    """Пересчитывает агрегаты произведения по его отзывам."""
+    totals = Review.objects.filter(title_id=title_id).aggregate(
+        score_sum=Sum('score'),
+        review_count=Count('id'),
+        rating=Avg('score'),
+        **{
+            name: Count('id', filter=Q(score=score))
+            for score, name in SCORE_FIELDS.items()
+        }
+    )
+    totals['score_sum'] = totals['score_sum'] or 0
+    Title.objects.filter(pk=title_id).update(**totals)
+
+
+def recalculate_titles(queryset):
+    """Пересчитывает агрегаты произведений одним UPDATE с подзапросами."""
+    reviews = (
+        Review.objects.filter(title_id=OuterRef('pk'))
+        .order_by()
+        .values('title_id')
+    )
+    score_sum = Coalesce(
+        Subquery(reviews.annotate(total=Sum('score')).values('total')), 0,
+        output_field=IntegerField()
+    )
+    review_count = Coalesce(
+        Subquery(reviews.annotate(total=Count('id')).values('total')), 0,
+        output_field=IntegerField()
+    )
+    return queryset.update(
+        score_sum=score_sum,
+        review_count=review_count,
+        rating=rating_expression(score_sum, review_count),
+        **histogram_counts(reviews)
+    )
+
+
+def subtract_reviews(reviews):
+    """
+    Вычитает отзывы из агрегатов их произведений одним UPDATE.
+
+    Вызывается до удаления отзывов в обход сигналов.
+    """
+    totals = (
+        reviews.filter(title_id=OuterRef('pk'))
+        .order_by()
+        .values('title_id')
+    )
+    score_sum = F('score_sum') - Coalesce(
+        Subquery(totals.annotate(total=Sum('score')).values('total')), 0,
+        output_field=IntegerField()
+    )
+    review_count = F('review_count') - Coalesce(
+        Subquery(totals.annotate(total=Count('id')).values('total')), 0,
+        output_field=IntegerField()
+    )
+    counters = {
+        name: F(name) - count
+        for name, count in histogram_counts(totals).items()
+    }
+    return Title.objects.filter(
+        pk__in=reviews.order_by().values('title_id')
+    ).update(
+        score_sum=score_sum,
+        review_count=review_count,
+        rating=rating_expression(score_sum, review_count),
+        **counters
+    )
@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models import Q
+
+from api.cache import BULK_VERSION, bump_versions_on_commit
+from reviews.aggregates import subtract_reviews
+from reviews.models import Comment, Review, TitleGenre
+from reviews.rankings import subtract_activity
+
+
+def raw_delete(queryset):
+    """
+    Один DELETE ... WHERE ... IN (подзапрос) без загрузки строк.
+
+    Сигналы не отправляются: вызывающий сам поправляет агрегаты.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def delete_titles(titles):
+    """
+    Удаляет произведения с отзывами и комментариями.
+
+    Число запросов не зависит от числа отзывов: зависимые строки
+    удаляются по подзапросу, а не коллектором Django по одной пачке.
+    """
+    reviews = Review.objects.filter(title__in=titles)
+    with transaction.atomic():
+        # Комментарии и связи с жанрами удаляются «быстро»: у моделей
+        # нет сигналов и зависимых таблиц.
+        Comment.objects.filter(review__in=reviews).delete()
+        raw_delete(reviews)
+        TitleGenre.objects.filter(title__in=titles).delete()
+        titles.delete()
+        bump_versions_on_commit('review', 'comment')
+
+
+def delete_users(users):
+    """Удаляет пользователей с их отзывами и комментариями."""
+    reviews = Review.objects.filter(author__in=users)
+    with transaction.atomic():
+        subtract_reviews(reviews)
+        subtract_activity(reviews)
+        Comment.objects.filter(
+            Q(author__in=users) | Q(review__in=reviews)
+        ).delete()
+        raw_delete(reviews)
+        users.delete()
+        bump_versions_on_commit('title', 'review', 'comment', BULK_VERSION)
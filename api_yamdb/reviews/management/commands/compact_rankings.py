@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import bump_versions
+from reviews.rankings import compact_rankings
+
+
+class Command(BaseCommand):
+    help = (
+        'Сдвигает окно трендов: удаляет устаревшую дневную активность '
+        'и пересчитывает счётчики /titles/trending/. Запускать раз в сутки.'
+    )
+
+    def handle(self, *args, **options):
+        expired, updated = compact_rankings()
+        bump_versions('title')
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено ячеек активности: {expired}, '
+            f'пересчитано произведений: {updated}'
+        ))
@@ -0,0 +1,129 @@
+import csv
+import time
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from api.cache import BULK_VERSION, bump_versions
+from reviews.aggregates import recalculate_titles
+from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+from users.models import User
+
+# Порядок важен: файлы ссылаются на строки из предыдущих.
+FILES = (
+    ('users.csv', User),
+    ('category.csv', Category),
+    ('genre.csv', Genre),
+    ('titles.csv', Title),
+    ('genre_title.csv', TitleGenre),
+    ('review.csv', Review),
+    ('comments.csv', Comment),
+)
+# Колонки CSV, которые хранят id связанной строки под именем поля.
+FK_COLUMNS = {
+    'category': 'category_id',
+    'title_id': 'title_id',
+    'genre_id': 'genre_id',
+    'review_id': 'review_id',
+    'author': 'author_id',
+}
+
+
+@contextmanager
+def explicit_dates(model):
+    """Сохраняет даты из CSV вместо auto_now_add."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из static/data/*.csv пакетами bulk_create.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=Path(settings.BASE_DIR) / 'static' / 'data',
+            type=Path,
+            help='Каталог с CSV-файлами.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            default=5000,
+            type=int,
+            help='Количество строк в одном INSERT.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not path.is_dir():
+            raise CommandError(f'Каталог {path} не найден')
+        for filename, model in FILES:
+            file_path = path / filename
+            if not file_path.exists():
+                self.stdout.write(f'{filename}: пропущен, файла нет')
+                continue
+            started = time.monotonic()
+            rows = self.load(file_path, model, options['batch_size'])
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self.stdout.write(
+                f'{filename}: {rows} строк за {elapsed:.2f} с '
+                f'({rows / elapsed:.0f} строк/с)'
+            )
+        self.reset_sequences()
+        bump_versions(
+            'title', 'genre', 'category', 'review', 'comment', BULK_VERSION
+        )
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена'))
+
+    def load(self, file_path, model, batch_size):
+        with open(file_path, encoding='utf-8', newline='') as file, \
+                transaction.atomic(), explicit_dates(model):
+            reader = csv.DictReader(file)
+            total = 0
+            while True:
+                batch = [
+                    self.build(model, row)
+                    for row in islice(reader, batch_size)
+                ]
+                if not batch:
+                    break
+                model.objects.bulk_create(batch, batch_size=batch_size)
+                total += len(batch)
+            if model is Review:
+                # bulk_create не вызывает сигналы, агрегаты считаем сразу.
+                recalculate_titles(Title.objects.all())
+        return total
+
+    def build(self, model, row):
+        values = {
+            FK_COLUMNS.get(column, column): value
+            for column, value in row.items()
+        }
+        instance = model(**values)
+        if model is User:
+            instance.password = make_password(None)
+            instance.fill_lookup_fields()
+        return instance
+
+    def reset_sequences(self):
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [model for _, model in FILES]
+        )
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
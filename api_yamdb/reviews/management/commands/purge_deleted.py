@@ -0,0 +1,81 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from api.cache import BULK_VERSION, bump_versions
+from reviews.deletion import delete_titles, raw_delete
+from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+
+
+def in_batches(queryset, batch_size, apply):
+    """
+    Применяет apply к строкам queryset пачками по batch_size id.
+
+    Каждая пачка — отдельная короткая транзакция, поэтому запись
+    в БД не блокируется надолго. Отдаёт число обработанных строк
+    после каждой пачки.
+    """
+    total = 0
+    while True:
+        ids = list(queryset.order_by('id').values_list('id', flat=True)
+                   [:batch_size])
+        if not ids:
+            return
+        with transaction.atomic():
+            apply(queryset.model.objects.filter(id__in=ids))
+        total += len(ids)
+        yield total
+
+
+class Command(BaseCommand):
+    help = (
+        'Окончательно удаляет помеченные is_deleted произведения, жанры '
+        'и категории и чистит связи, оставшиеся без жанра или произведения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            default=1000,
+            type=int,
+            help='Количество строк в одной транзакции.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        reviews = Review.objects.filter(title__is_deleted=True)
+        steps = (
+            ('категории сняты с произведений',
+             Title.objects.filter(category__is_deleted=True),
+             lambda batch: batch.update(category=None)),
+            ('связи с удалёнными жанрами',
+             TitleGenre.objects.filter(genre__is_deleted=True),
+             lambda batch: batch.delete()),
+            ('связи без жанра или произведения',
+             TitleGenre.objects.filter(
+                 Q(genre__isnull=True) | Q(title__isnull=True)
+             ),
+             lambda batch: batch.delete()),
+            ('отзывы удалённых произведений', reviews, self.delete_reviews),
+            ('произведения', Title.objects.filter(is_deleted=True),
+             delete_titles),
+            ('жанры', Genre.objects.filter(is_deleted=True),
+             lambda batch: batch.delete()),
+            ('категории', Category.objects.filter(is_deleted=True),
+             lambda batch: batch.delete()),
+        )
+        for label, queryset, apply in steps:
+            count = 0
+            for count in in_batches(queryset, batch_size, apply):
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'{label}: {count}...')
+            self.stdout.write(f'{label}: {count}')
+        bump_versions(
+            'title', 'genre', 'category', 'review', 'comment', BULK_VERSION
+        )
+        self.stdout.write(self.style.SUCCESS('Очистка завершена'))
+
+    def delete_reviews(self, reviews):
+        # Агрегаты не правим: произведение удаляется следом.
+        Comment.objects.filter(review__in=reviews).delete()
+        raw_delete(reviews)
@@ -0,0 +1,156 @@
+import math
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from api.cache import bump_versions, object_version
+from reviews.aggregates import recalculate_titles
+from reviews.models import SCORE_FIELDS, Review, Title
+
+
+def parse_since(value):
+    """Дата или дата-время ISO 8601 в aware datetime."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f'Не удалось разобрать дату {value!r}')
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def actual_totals(title_ids):
+    """
+    Сумма оценок, число отзывов и гистограмма оценок по произведениям
+    одним GROUP BY.
+    """
+    rows = (
+        Review.objects.filter(title_id__in=title_ids)
+        .values('title_id')
+        .annotate(
+            score_sum=Sum('score'),
+            review_count=Count('id'),
+            **{
+                name: Count('id', filter=Q(score=score))
+                for score, name in SCORE_FIELDS.items()
+            }
+        )
+        .order_by()
+    )
+    return {
+        row['title_id']: (
+            row['score_sum'],
+            row['review_count'],
+            [row[name] for name in SCORE_FIELDS.values()]
+        )
+        for row in rows
+    }
+
+
+def differs(title, score_sum, review_count, histogram):
+    if (title.score_sum, title.review_count) != (score_sum, review_count):
+        return True
+    if title.score_histogram() != histogram:
+        return True
+    rating = score_sum / review_count if review_count else None
+    if rating is None or title.rating is None:
+        return rating != title.rating
+    return not math.isclose(rating, title.rating)
+
+
+def title_batches(titles, batch_size, since=None):
+    """
+    Пачки произведений по id: каждая читается и правится отдельно,
+    блокировка записи держится только на один UPDATE.
+
+    С since id произведений со свежими отзывами читаются один раз:
+    индекса по одной pub_date нет, и подзапрос в каждой пачке
+    сканировал бы все отзывы заново.
+    """
+    if since is not None:
+        ids = sorted(
+            Review.objects.filter(pub_date__gte=since)
+            .order_by()
+            .values_list('title_id', flat=True)
+            .distinct()
+        )
+        for start in range(0, len(ids), batch_size):
+            yield list(titles.filter(id__in=ids[start:start + batch_size]))
+        return
+    last_id = 0
+    while True:
+        batch = list(titles.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return
+        last_id = batch[-1].id
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Сверяет агрегаты произведений (сумма оценок, число отзывов, '
+        'рейтинг, гистограмма оценок) с отзывами и исправляет расхождения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            default=1000,
+            type=int,
+            help='Количество произведений в одной проверке.'
+        )
+        parser.add_argument(
+            '--since',
+            type=parse_since,
+            help='Проверять только произведения с отзывами не старше даты.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать расхождения, ничего не менять.'
+        )
+
+    def handle(self, *args, **options):
+        titles = Title.objects.only(
+            'id', 'score_sum', 'review_count', 'rating',
+            *SCORE_FIELDS.values()
+        ).order_by('id')
+        checked = wrong = 0
+        for batch in title_batches(
+            titles, options['batch_size'], options['since']
+        ):
+            totals = actual_totals([title.id for title in batch])
+            broken = []
+            for title in batch:
+                score_sum, review_count, histogram = totals.get(
+                    title.id, (0, 0, [0] * len(SCORE_FIELDS))
+                )
+                if differs(title, score_sum, review_count, histogram):
+                    broken.append(title.id)
+                    if options['verbosity'] > 1:
+                        self.stdout.write(
+                            f'{title.id}: {title.score_sum}/'
+                            f'{title.review_count} -> '
+                            f'{score_sum}/{review_count}'
+                        )
+            checked += len(batch)
+            wrong += len(broken)
+            if broken and not options['dry_run']:
+                # Пересчёт внутри UPDATE, а не запись прочитанных выше
+                # значений: отзывы, пришедшие за это время, не теряются.
+                with transaction.atomic():
+                    recalculate_titles(Title.objects.filter(id__in=broken))
+                bump_versions(*(object_version('title', pk) for pk in broken))
+        if wrong and not options['dry_run']:
+            bump_versions('title')
+        action = 'найдено' if options['dry_run'] else 'исправлено'
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено произведений: {checked}, {action} расхождений: '
+            f'{wrong}'
+        ))
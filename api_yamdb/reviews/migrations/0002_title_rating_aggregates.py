@@ -0,0 +1,50 @@
+# Generated by Django 3.2 on 2026-10-18 04:15
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, Sum
+
+
+def fill_aggregates(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    totals = (
+        Review.objects.values('title_id')
+        .annotate(
+            score_sum=Sum('score'),
+            review_count=Count('id'),
+            rating=Avg('score')
+        )
+        .order_by()
+    )
+    for row in totals.iterator():
+        Title.objects.filter(pk=row['title_id']).update(
+            score_sum=row['score_sum'],
+            review_count=row['review_count'],
+            rating=row['rating']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+FTS_TABLE = 'reviews_title_fts'
+
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    "name, description, content='reviews_title', content_rowid='id', "
+    "tokenize='trigram')",
+    f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON reviews_title BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON reviews_title BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    f"CREATE TRIGGER {FTS_TABLE}_au "
+    "AFTER UPDATE OF name, description ON reviews_title BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+DROP_SQL = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+
+
+def create_fts(apps, schema_editor):
+    # Индекс нужен только SQLite с FTS5 и токенизатором trigram
+    # (3.34+); без него поиск работает через icontains.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute(CREATE_SQL[0])
+        except OperationalError:
+            return
+        for statement in CREATE_SQL[1:]:
+            cursor.execute(statement)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in DROP_SQL:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_title_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
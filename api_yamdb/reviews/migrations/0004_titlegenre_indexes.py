@@ -0,0 +1,39 @@
+# Generated by Django 3.2 on 2026-10-18 04:36
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicates(apps, schema_editor):
+    # Из повторяющихся пар (title, genre) остаётся самая ранняя.
+    TitleGenre = apps.get_model('reviews', 'TitleGenre')
+    keep = (
+        TitleGenre.objects.values('title_id', 'genre_id')
+        .annotate(keep=Min('id'))
+        .order_by()
+        .values('keep')
+    )
+    TitleGenre.objects.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='titlegenre',
+            options={'verbose_name': 'm2m_model_title', 'verbose_name_plural': 'm2m_model_titles'},
+        ),
+        migrations.AddIndex(
+            model_name='titlegenre',
+            index=models.Index(fields=['genre', 'title'], name='titlegenre_genre_title_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='titlegenre',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_title_genre'),
+        ),
+    ]
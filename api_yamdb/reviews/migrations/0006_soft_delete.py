@@ -0,0 +1,55 @@
+# Generated by Django 3.2 on 2026-10-18 04:39
+
+from importlib import import_module
+
+import django.core.validators
+from django.db import migrations, models
+
+# SQLite пересоздаёт reviews_title при добавлении поля, и триггеры
+# полнотекстового индекса пропадают: пересоздаём его вокруг AddField.
+fts = import_module('reviews.migrations.0003_title_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_review_comment_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='is_deleted',
+            field=models.BooleanField(db_index=True, default=False, verbose_name='Удалено'),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='is_deleted',
+            field=models.BooleanField(db_index=True, default=False, verbose_name='Удалено'),
+        ),
+        migrations.RunPython(fts.drop_fts, fts.create_fts),
+        migrations.AddField(
+            model_name='title',
+            name='is_deleted',
+            field=models.BooleanField(db_index=True, default=False, verbose_name='Удалено'),
+        ),
+        migrations.RunPython(fts.create_fts, fts.drop_fts),
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(validators=[django.core.validators.RegexValidator(message='Поле "slug" должно состоять из символов:[0-9a-zA-Z]', regex='^[0-9a-zA-Z]*$')], verbose_name='slug'),
+        ),
+        migrations.AlterField(
+            model_name='genre',
+            name='slug',
+            field=models.SlugField(verbose_name='slug'),
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(condition=models.Q(is_deleted=False), fields=('slug',), name='unique_active_category_slug'),
+        ),
+        migrations.AddConstraint(
+            model_name='genre',
+            constraint=models.UniqueConstraint(condition=models.Q(is_deleted=False), fields=('slug',), name='unique_active_genre_slug'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 3.2 on 2026-10-18 04:50
+
+from importlib import import_module
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# См. 0006: AddField пересоздаёт reviews_title вместе с триггерами FTS.
+fts = import_module('reviews.migrations.0003_title_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_soft_delete'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(db_index=True, verbose_name='День')),
+                ('reviews', models.PositiveIntegerField(default=0, verbose_name='Новых отзывов')),
+            ],
+            options={
+                'verbose_name': 'Активность произведения',
+                'verbose_name_plural': 'Активность произведений',
+            },
+        ),
+        migrations.RunPython(fts.drop_fts, fts.create_fts),
+        migrations.AddField(
+            model_name='title',
+            name='trending',
+            field=models.PositiveIntegerField(default=0, verbose_name='Отзывов за окно трендов'),
+        ),
+        migrations.RunPython(fts.create_fts, fts.drop_fts),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['-rating', 'id'], name='title_top_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['category', '-rating', 'id'], name='title_category_top_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['-trending', 'id'], name='title_trending_idx'),
+        ),
+        migrations.AddField(
+            model_name='titleactivity',
+            name='title',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='reviews.title', verbose_name='Произведение'),
+        ),
+        migrations.AddConstraint(
+            model_name='titleactivity',
+            constraint=models.UniqueConstraint(fields=('title', 'day'), name='unique_title_activity_day'),
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 3.2 on 2026-10-18 04:51
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# См. 0006: AddField пересоздаёт reviews_title вместе с триггерами FTS.
+fts = import_module('reviews.migrations.0003_title_fts')
+
+
+def fill_histogram(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    counters = {}
+    for score in range(1, 11):
+        counts = (
+            Review.objects.filter(title_id=OuterRef('pk'), score=score)
+            .order_by()
+            .values('title_id')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        counters[f'score_{score}'] = Coalesce(
+            Subquery(counts), 0, output_field=IntegerField()
+        )
+    Title.objects.filter(review_count__gt=0).update(**counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_rankings'),
+    ]
+
+    operations = [
+        migrations.RunPython(fts.drop_fts, fts.create_fts),
+        migrations.AddField(
+            model_name='title',
+            name='score_1',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 1'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_10',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 10'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_2',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 2'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_3',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 3'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_4',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 4'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_5',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 5'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_6',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 6'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_7',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 7'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_8',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 8'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_9',
+            field=models.PositiveIntegerField(default=0, verbose_name='Оценок 9'),
+        ),
+        migrations.RunPython(fill_histogram, migrations.RunPython.noop),
+        migrations.RunPython(fts.create_fts, fts.drop_fts),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 05:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_score_histogram'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['name', 'id'], name='title_name_id_idx'),
+        ),
+    ]
@@ -11,6 +11,11 @@ from users.models import User
 
 MIN_RATING = 1
 MAX_RATING = 10
+# Гистограмма оценок произведения: по счётчику на оценку, чтобы отзыв
+# менял её тем же UPDATE, что и рейтинг.
+SCORE_FIELDS = {
+    score: f'score_{score}' for score in range(MIN_RATING, MAX_RATING + 1)
+}
 
 
 class Genre(models.Model):
@@ -20,14 +25,26 @@ class Genre(models.Model):
     )
     slug = models.SlugField(
         max_length=50,
-        unique=True,
         verbose_name='slug'
     )
+    is_deleted = models.BooleanField(
+        default=False,
+        db_index=True,
+        verbose_name='Удалено'
+    )
 
     class Meta:
         verbose_name = 'Жанр'
         verbose_name_plural = 'Жанры'
         ordering = ('name',)
+        # slug удалённого жанра можно сразу занять новым.
+        constraints = (
+            models.UniqueConstraint(
+                fields=('slug',),
+                condition=models.Q(is_deleted=False),
+                name='unique_active_genre_slug'
+            ),
+        )
 
     def __str__(self):
         return self.name
@@ -40,7 +57,6 @@ class Category(models.Model):
     )
     slug = models.SlugField(
         max_length=50,
-        unique=True,
         verbose_name='slug',
         validators=[RegexValidator(
             regex=r'^[0-9a-zA-Z]*$',
@@ -48,11 +64,23 @@ class Category(models.Model):
         )
         ]
     )
+    is_deleted = models.BooleanField(
+        default=False,
+        db_index=True,
+        verbose_name='Удалено'
+    )
 
     class Meta:
         verbose_name = 'Категория'
         verbose_name_plural = 'Категория'
         ordering = ('name',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=('slug',),
+                condition=models.Q(is_deleted=False),
+                name='unique_active_category_slug'
+            ),
+        )
 
     def __str__(self):
         return self.name
@@ -82,15 +110,122 @@ class Title(models.Model):
         verbose_name='Категория',
         related_name='titles'
     )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок'
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество отзывов'
+    )
+    rating = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name='Рейтинг'
+    )
+    trending = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Отзывов за окно трендов'
+    )
+    # Гистограмма оценок: по счётчику на оценку из SCORE_FIELDS.
+    score_1 = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 1'
+    )
+    score_2 = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 2'
+    )
+    score_3 = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 3'
+    )
+    score_4 = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 4'
+    )
+    score_5 = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 5'
+    )
+    score_6 = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 6'
+    )
+    score_7 = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 7'
+    )
+    score_8 = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 8'
+    )
+    score_9 = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 9'
+    )
+    score_10 = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Оценок 10'
+    )
+    is_deleted = models.BooleanField(
+        default=False,
+        db_index=True,
+        verbose_name='Удалено'
+    )
 
     class Meta:
         verbose_name = 'Название'
         verbose_name_plural = 'Названия'
         ordering = ('name',)
+        # Рейтинги /titles/top/ и /titles/trending/ читаются
+        # диапазоном частичного индекса по неудалённым произведениям,
+        # без сортировки каталога.
+        indexes = (
+            # Курсорная пагинация списка по (name, id).
+            models.Index(
+                fields=('name', 'id'),
+                condition=models.Q(is_deleted=False),
+                name='title_name_id_idx'
+            ),
+            models.Index(
+                fields=('-rating', 'id'),
+                condition=models.Q(is_deleted=False),
+                name='title_top_idx'
+            ),
+            models.Index(
+                fields=('category', '-rating', 'id'),
+                condition=models.Q(is_deleted=False),
+                name='title_category_top_idx'
+            ),
+            models.Index(
+                fields=('-trending', 'id'),
+                condition=models.Q(is_deleted=False),
+                name='title_trending_idx'
+            ),
+        )
 
     def __str__(self):
         return self.name
 
+    def score_histogram(self):
+        """Число оценок от MIN_RATING до MAX_RATING."""
+        return [getattr(self, name) for name in SCORE_FIELDS.values()]
+
+    def score_median(self):
+        """Медиана оценок по гистограмме, None без отзывов."""
+        counts = self.score_histogram()
+        total = sum(counts)
+        if not total:
+            return None
+        middle = ((total - 1) // 2, total // 2)
+        values, seen = [], 0
+        for score, count in zip(SCORE_FIELDS, counts):
+            values += [score for position in middle
+                       if seen <= position < seen + count]
+            seen += count
+        return sum(values) / len(values)
+
 
 class TitleGenre(models.Model):
     title = models.ForeignKey(
@@ -109,7 +244,19 @@ class TitleGenre(models.Model):
     class Meta:
         verbose_name = 'm2m_model_title'
         verbose_name_plural = 'm2m_model_titles'
-        ordering = ('title',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'genre'),
+                name='unique_title_genre'
+            ),
+        )
+        # Фильтр по жанру: диапазон индекса вместо поиска по title.
+        indexes = (
+            models.Index(
+                fields=('genre', 'title'),
+                name='titlegenre_genre_title_idx'
+            ),
+        )
 
     def __str__(self):
         return f'{self.title} {self.genre}'
@@ -152,11 +299,27 @@ class Review(models.Model):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         unique_together = ('title', 'author')
-        ordering = ('title',)
+        ordering = ('pub_date', 'id')
+        # Отзывы одного произведения читаются по индексу уже в порядке
+        # выдачи, без сортировки в памяти.
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         return f'{self.text}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Оценка на момент загрузки нужна, чтобы при редактировании
+        # отзыва поправить агрегаты произведения на разницу.
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
@@ -180,7 +343,41 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
-        ordering = ('review',)
+        ordering = ('pub_date', 'id')
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         return f'{self.text}'
+
+
+class TitleActivity(models.Model):
+    """Число новых отзывов к произведению за день (для трендов)."""
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='activity',
+        verbose_name='Произведение'
+    )
+    day = models.DateField(db_index=True, verbose_name='День')
+    reviews = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Новых отзывов'
+    )
+
+    class Meta:
+        verbose_name = 'Активность произведения'
+        verbose_name_plural = 'Активность произведений'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'day'),
+                name='unique_title_activity_day'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.title_id} {self.day}: {self.reviews}'
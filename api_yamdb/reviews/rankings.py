@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from reviews.models import Title, TitleActivity
+
+
+def window_start():
+    """Первый день окна трендов (TRENDING_WINDOW_DAYS дней до сегодня)."""
+    return timezone.localdate() - timedelta(
+        days=settings.TRENDING_WINDOW_DAYS - 1
+    )
+
+
+def record_activity(title_id, pub_date, delta):
+    """
+    Учитывает новый (delta=1) или удалённый (-1) отзыв в дневной ячейке.
+
+    Возвращает True, если ячейка в окне трендов изменилась и на
+    столько же нужно сдвинуть Title.trending.
+    """
+    day = timezone.localdate(pub_date)
+    if day < window_start():
+        return False
+    cells = TitleActivity.objects.filter(title_id=title_id, day=day)
+    if delta < 0:
+        return bool(cells.filter(reviews__gt=0).update(
+            reviews=F('reviews') + delta
+        ))
+    if cells.update(reviews=F('reviews') + delta):
+        return True
+    try:
+        with transaction.atomic():
+            TitleActivity.objects.create(
+                title_id=title_id, day=day, reviews=delta
+            )
+    except IntegrityError:
+        # Ячейку успел создать параллельный отзыв.
+        cells.update(reviews=F('reviews') + delta)
+    return True
+
+
+def subtract_activity(reviews):
+    """
+    Вычитает отзывы окна трендов из дневных ячеек и Title.trending
+    двумя UPDATE.
+
+    Вызывается до удаления отзывов в обход сигналов. День отзыва
+    (`pub_date__date`) считается в текущем часовом поясе, как
+    в record_activity.
+    """
+    recent = reviews.filter(pub_date__date__gte=window_start()).order_by()
+
+    def removed(**outer):
+        counts = (
+            recent.filter(**outer)
+            .values('title_id')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        return Coalesce(Subquery(counts), 0, output_field=IntegerField())
+
+    TitleActivity.objects.filter(
+        title_id__in=recent.values('title_id'), day__gte=window_start()
+    ).update(reviews=Greatest(
+        F('reviews') - removed(
+            title_id=OuterRef('title_id'), pub_date__date=OuterRef('day')
+        ),
+        0
+    ))
+    return Title.objects.filter(
+        pk__in=recent.values('title_id')
+    ).update(trending=Greatest(
+        F('trending') - removed(title_id=OuterRef('pk')), 0
+    ))
+
+
+def compact_rankings():
+    """
+    Сдвигает окно трендов: удаляет старые ячейки и пересчитывает
+    Title.trending по оставшимся одним UPDATE.
+
+    Возвращает число удалённых ячеек и обновлённых произведений.
+    """
+    start = window_start()
+    with transaction.atomic():
+        expired, _ = TitleActivity.objects.filter(day__lt=start).delete()
+        recent = (
+            TitleActivity.objects.filter(title_id=OuterRef('pk'))
+            .order_by()
+            .values('title_id')
+            .annotate(total=Sum('reviews'))
+            .values('total')
+        )
+        updated = Title.objects.filter(
+            Q(trending__gt=0)
+            | Q(id__in=TitleActivity.objects.values('title_id'))
+        ).update(trending=Coalesce(
+            Subquery(recent), 0, output_field=IntegerField()
+        ))
+    return expired, updated
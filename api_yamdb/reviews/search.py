@@ -0,0 +1,86 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from reviews.models import Title
+
+FTS_TABLE = 'reviews_title_fts'
+# Триграммы дают поиск подстроки без учёта регистра, как у icontains,
+# но по индексу. Более короткие фрагменты индекс найти не может.
+MIN_TERM_LENGTH = 3
+
+_enabled = {}
+
+
+def fts_enabled(using=DEFAULT_DB_ALIAS):
+    """Есть ли в БД полнотекстовый индекс произведений."""
+    if using not in _enabled:
+        connection = connections[using]
+        _enabled[using] = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _enabled[using]
+
+
+def build_phrase(value, column=None):
+    """
+    Вся строка одной фразой FTS5: совпадает как подстрока, с пробелами.
+
+    Возвращает None, если строку нельзя найти по индексу.
+    """
+    if len(value) < MIN_TERM_LENGTH:
+        return None
+    prefix = f'{column} : ' if column else ''
+    return prefix + '"{}"'.format(value.replace('"', '""'))
+
+
+def build_match(value, column=None):
+    """
+    Собирает запрос FTS5: каждое слово — фраза, слова через AND.
+
+    Возвращает None, если запрос нельзя выполнить по индексу.
+    """
+    phrases = [build_phrase(term, column) for term in value.split()]
+    if not phrases or None in phrases:
+        return None
+    return ' AND '.join(phrases)
+
+
+def _matching_ids(match):
+    return RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        (match,)
+    )
+
+
+def filter_name(queryset, value):
+    """Замена `name__icontains`, работающая по индексу."""
+    match = build_phrase(value, column='name')
+    if match is None or not fts_enabled(queryset.db):
+        return queryset.filter(name__icontains=value)
+    return queryset.filter(id__in=_matching_ids(match))
+
+
+def search_titles(queryset, value):
+    """Поиск по названию и описанию с сортировкой по релевантности."""
+    match = build_match(value)
+    if match is None or not fts_enabled(queryset.db):
+        condition = Q()
+        for term in value.split():
+            condition &= (Q(name__icontains=term)
+                          | Q(description__icontains=term))
+        return queryset.filter(condition)
+    # Индекс присоединяется один раз: MATCH выполняется одним проходом,
+    # а bm25() читается из той же строки индекса. COUNT пагинатора
+    # сбрасывает extra select, поэтому ранг при подсчёте не считается.
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = {Title._meta.db_table}.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[match],
+        select={'search_rank': f'bm25({FTS_TABLE})'},
+        order_by=['search_rank', 'id'],
+    )
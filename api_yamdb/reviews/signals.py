@@ -0,0 +1,61 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.cache import bump_versions_on_commit, object_version
+from reviews.aggregates import apply_review_delta, recalculate_title
+from reviews.models import Category, Genre, Review
+from reviews.rankings import record_activity
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """Учитывает новый или изменённый отзыв в агрегатах произведения."""
+    if created:
+        trending = record_activity(instance.title_id, instance.pub_date, 1)
+        apply_review_delta(
+            instance.title_id, instance.score, 1, int(trending),
+            {instance.score: 1}
+        )
+    elif getattr(instance, '_loaded_score', None) is None:
+        recalculate_title(instance.title_id)
+    elif instance.score != instance._loaded_score:
+        apply_review_delta(
+            instance.title_id, instance.score - instance._loaded_score, 0,
+            histogram={instance._loaded_score: -1, instance.score: 1}
+        )
+    instance._loaded_score = instance.score
+    bump_review_versions(instance)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Убирает удалённый отзыв (в том числе каскадом) из агрегатов."""
+    score = getattr(instance, '_loaded_score', None)
+    if score is None:
+        score = instance.score
+    trending = record_activity(instance.title_id, instance.pub_date, -1)
+    apply_review_delta(
+        instance.title_id, -score, -1, -int(trending), {score: -1}
+    )
+    bump_review_versions(instance)
+
+
+def bump_review_versions(review):
+    """Меняет ETag отзывов произведения и комментариев к отзыву."""
+    bump_versions_on_commit(
+        object_version('title', review.title_id),
+        object_version('review', review.pk)
+    )
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genre_changed(sender, **kwargs):
+    """Снимок жанров (api.snapshot) перечитается и после правки в админке."""
+    bump_versions_on_commit('genre')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, **kwargs):
+    bump_versions_on_commit('category')
@@ -0,0 +1,72 @@
+import copy
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    """LRU-кэш пользователей по id с ограниченным временем жизни."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.items = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, user_id):
+        with self.lock:
+            item = self.items.get(user_id)
+            if item is None:
+                return None
+            expires, user = item
+            if expires < monotonic():
+                del self.items[user_id]
+                return None
+            self.items.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user):
+        with self.lock:
+            self.items[user_id] = (monotonic() + self.ttl, user)
+            self.items.move_to_end(user_id)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.items.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication без запроса к БД для недавно виденных пользователей.
+
+    Кэш живёт в процессе; изменения пользователя сбрасывают запись
+    сигналами, а в других процессах её устаревание ограничено TTL.
+    """
+
+    def get_user(self, validated_token):
+        if getattr(api_settings, 'CHECK_REVOKE_TOKEN', False):
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Токен не содержит идентификатор пользователя')
+        user = user_cache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+        # Вьюхи меняют request.user на месте, поэтому отдаём копию.
+        return copy.copy(user)
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди пачками через одно соединение.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            type=int,
+            help='Количество писем в одной пачке.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а ждать новых писем.'
+        )
+        parser.add_argument(
+            '--interval',
+            default=1.0,
+            type=float,
+            help='Пауза между проверками очереди в режиме --loop, с.'
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            sent = send_pending(options['batch_size'])
+            total += sent
+            if sent:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(f'Отправлено писем: {total}')
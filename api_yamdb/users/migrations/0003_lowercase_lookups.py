@@ -0,0 +1,54 @@
+# Generated by Django 3.2 on 2026-10-18 04:29
+
+from django.db import migrations, models
+
+
+def fill_lookup_fields(apps, schema_editor):
+    # При совпадении без учёта регистра значение получает только
+    # самый ранний пользователь, у остальных остаётся NULL.
+    User = apps.get_model('users', 'User')
+    usernames, emails = set(), set()
+    batch = []
+    for user in User.objects.order_by('id').iterator():
+        username = user.username.lower() if user.username else None
+        email = user.email.lower() if user.email else None
+        user.username_lower = username if username not in usernames else None
+        user.email_lower = email if email not in emails else None
+        usernames.add(username)
+        emails.add(email)
+        batch.append(user)
+        if len(batch) >= 1000:
+            User.objects.bulk_update(batch, ('username_lower', 'email_lower'))
+            batch = []
+    User.objects.bulk_update(batch, ('username_lower', 'email_lower'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_lower',
+            field=models.EmailField(editable=False, max_length=150, null=True, verbose_name='Электронная почта в нижнем регистре'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='username_lower',
+            field=models.CharField(editable=False, max_length=150, null=True, verbose_name='Имя пользователя в нижнем регистре'),
+        ),
+        migrations.RunPython(fill_lookup_fields, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='user',
+            name='email_lower',
+            field=models.EmailField(editable=False, max_length=150, null=True, unique=True, verbose_name='Электронная почта в нижнем регистре'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='username_lower',
+            field=models.CharField(editable=False, max_length=150, null=True, unique=True, verbose_name='Имя пользователя в нижнем регистре'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 05:01
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_lowercase_lookups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='claim',
+            field=models.UUIDField(blank=True, null=True, verbose_name='Метка отправителя'),
+        ),
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='next_attempt_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Следующая попытка'),
+        ),
+    ]
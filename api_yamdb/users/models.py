@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -43,11 +44,65 @@ class User(AbstractUser):
         max_length=settings.USER_FIELD_LEN,
         null=True
     )
+    # Копии в нижнем регистре: поиск без учёта регистра идёт
+    # по уникальному индексу, а не сканом с LIKE/UPPER().
+    username_lower = models.CharField(
+        'Имя пользователя в нижнем регистре',
+        max_length=settings.USER_FIELD_LEN,
+        unique=True,
+        null=True,
+        editable=False
+    )
+    email_lower = models.EmailField(
+        'Электронная почта в нижнем регистре',
+        max_length=settings.USER_FIELD_LEN,
+        unique=True,
+        null=True,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_lookup_sources()
+        return instance
+
+    def remember_lookup_sources(self):
+        # Через __dict__, чтобы не подгружать отложенные поля.
+        self.lookup_sources = (
+            self.__dict__.get('username'), self.__dict__.get('email')
+        )
+
+    def fill_lookup_fields(self, only_changed=False):
+        """Копии в нижнем регистре (only_changed — для изменённых полей)."""
+        username, email = getattr(self, 'lookup_sources', (None, None))
+        if not only_changed or self.username != username:
+            self.username_lower = (
+                self.username.lower() if self.username else None
+            )
+        if not only_changed or self.email != email:
+            self.email_lower = self.email.lower() if self.email else None
+
+    def save(self, *args, **kwargs):
+        # Копии пересчитываются только при смене исходного поля:
+        # у пользователей, чьи копии миграция 0003 оставила пустыми
+        # из-за совпадений, обычное сохранение не нарушит уникальность.
+        self.fill_lookup_fields(only_changed=not self._state.adding)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'username' in update_fields:
+                update_fields.add('username_lower')
+            if 'email' in update_fields:
+                update_fields.add('email_lower')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+        self.remember_lookup_sources()
+
     @property
     def is_user(self):
         return self.role == self.USER
@@ -63,3 +118,30 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
+
+
+class OutgoingEmail(models.Model):
+    recipient = models.EmailField(
+        'Получатель',
+        max_length=settings.USER_FIELD_LEN
+    )
+    subject = models.CharField('Тема', max_length=256)
+    body = models.TextField('Текст')
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, db_index=True)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка',
+        default=timezone.now,
+        db_index=True
+    )
+    claim = models.UUIDField('Метка отправителя', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('id',)
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,115 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+
+# Один поток: письма процесса уходят по очереди и не дублируются.
+executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='outbox')
+
+
+def queue_email(subject, body, recipient):
+    """Сохраняет письмо в очередь и планирует отправку после коммита."""
+    OutgoingEmail.objects.create(
+        subject=subject, body=body, recipient=recipient
+    )
+    delivery = settings.EMAIL_OUTBOX_DELIVERY
+    if delivery == 'inline':
+        transaction.on_commit(send_pending)
+    elif delivery == 'thread':
+        transaction.on_commit(lambda: executor.submit(send_in_thread))
+
+
+def send_in_thread():
+    try:
+        while send_pending():
+            pass
+    finally:
+        close_old_connections()
+
+
+def claim_batch(batch_size):
+    """
+    Забирает пачку писем, которым пора уходить, и возвращает её.
+
+    Письма помечаются одним UPDATE со случайной меткой и сдвигом
+    next_attempt_at, поэтому другой поток, процесс или send_outbox
+    их не возьмёт. Если отправитель упадёт, письма вернутся
+    в очередь через EMAIL_OUTBOX_CLAIM_TIMEOUT.
+    """
+    now = timezone.now()
+    due = OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        next_attempt_at__lte=now
+    )
+    claim = uuid4()
+    due.filter(
+        pk__in=due.order_by('id').values('pk')[:batch_size]
+    ).update(
+        claim=claim,
+        next_attempt_at=now + timedelta(
+            seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT
+        )
+    )
+    return list(OutgoingEmail.objects.filter(claim=claim))
+
+
+def retry_at(attempts):
+    """Время следующей попытки: пауза удваивается с каждой неудачей."""
+    return timezone.now() + timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def send_pending(batch_size=None):
+    """
+    Отправляет пачку писем из очереди через одно соединение.
+
+    Возвращает количество отправленных писем (0 — отправлять нечего).
+    Неудачные попытки откладываются и в счёт не идут, поэтому цикл
+    `while send_pending()` не повторяет их сразу же.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0
+    sent, failed = [], []
+    try:
+        connection = get_connection()
+        connection.open()
+    except Exception as error:
+        connection, failed = None, [(email, str(error)) for email in emails]
+    if connection is not None:
+        with connection:
+            for email in emails:
+                message = EmailMessage(
+                    email.subject,
+                    email.body,
+                    settings.NO_REPLY_MAIL,
+                    [email.recipient],
+                    connection=connection
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    failed.append((email, str(error)))
+                else:
+                    sent.append(email.pk)
+    OutgoingEmail.objects.filter(pk__in=sent).update(
+        sent_at=timezone.now(), attempts=F('attempts') + 1, claim=None
+    )
+    for email, error in failed:
+        OutgoingEmail.objects.filter(pk=email.pk).update(
+            attempts=F('attempts') + 1,
+            last_error=error,
+            next_attempt_at=retry_at(email.attempts + 1),
+            claim=None
+        )
+    return len(sent)
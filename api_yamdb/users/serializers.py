@@ -10,10 +10,11 @@ from rest_framework.serializers import (CharField,
                                         ValidationError)
 from rest_framework.validators import UniqueValidator
 
+from api.mixins import ServerTimingSerializerMixin
 from users.models import User
 
 
-class UserSerializer(ModelSerializer):
+class UserSerializer(ServerTimingSerializerMixin, ModelSerializer):
     username = CharField(
         max_length=settings.USER_FIELD_LEN,
         validators=[
@@ -35,6 +36,22 @@ class UserSerializer(ModelSerializer):
                   'role',
                   'bio')
 
+    def check_lookup_unique(self, field, value):
+        users = User.objects.filter(**{f'{field}_lower': value.lower()})
+        if self.instance is not None:
+            users = users.exclude(pk=self.instance.pk)
+        return not users.exists()
+
+    def validate_username(self, value):
+        if not self.check_lookup_unique('username', value):
+            raise ValidationError(f'Пользователь "{value}" уже существует')
+        return value
+
+    def validate_email(self, value):
+        if not self.check_lookup_unique('email', value):
+            raise ValidationError('Электронный адрес уже существует')
+        return value
+
 
 class UserMeSerializer(UserSerializer):
     role = CharField(read_only=True)
@@ -74,10 +91,10 @@ class SignUpSerializer(ModelSerializer):
         username = data.get('username')
         email = data.get('email')
 
-        if User.objects.filter(email__iexact=email).exists():
+        if User.objects.filter(email_lower=email.lower()).exists():
             raise ValidationError('Электронный адрес уже существует')
 
-        if User.objects.filter(username__iexact=username).exists():
+        if User.objects.filter(username_lower=username.lower()).exists():
             raise ValidationError(f'Пользователь "{username}" уже существует')
 
         if username.lower() == 'me':
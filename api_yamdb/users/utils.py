@@ -2,10 +2,10 @@ import random
 from string import ascii_letters, digits
 
 from django.conf import settings
-from django.core.mail import send_mail
 from rest_framework.generics import get_object_or_404
 
 from users.models import User
+from users.outbox import queue_email
 
 
 def sender_confirmation_code(request):
@@ -16,10 +16,8 @@ def sender_confirmation_code(request):
     )
     user.confirmation_code = ''.join(confirmation_code)
     user.save()
-    send_mail(
+    queue_email(
         'Код подтвержения',
         f'Ваш код: {user.confirmation_code}',
-        settings.NO_REPLY_MAIL,
-        [request.data.get('email')],
-        fail_silently=False,
+        request.data.get('email'),
     )
@@ -10,7 +10,11 @@ from rest_framework.status import (HTTP_200_OK,
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
+from api.cache import bump_versions_on_commit, object_version
+from api.mixins import ServerTimingMixin
 from api.permissions import IsAdmin
+from reviews.deletion import delete_users
+from reviews.models import Comment, Review
 from users.models import User
 from users.utils import sender_confirmation_code
 
@@ -20,7 +24,26 @@ from users.serializers import (GetTokenSerializer,
                                UserSerializer)
 
 
-class UserViewSet(ModelViewSet):
+def bump_author_versions(user):
+    """
+    Меняет ETag веток, где автор подписан прежним username.
+
+    Это отзывы произведений с его отзывами и комментарии к отзывам,
+    которые он комментировал; остальные ветки не затрагиваются.
+    """
+    titles = Review.objects.filter(author=user).values_list(
+        'title_id', flat=True
+    ).distinct()
+    reviews = Comment.objects.filter(author=user).values_list(
+        'review_id', flat=True
+    ).distinct()
+    bump_versions_on_commit(
+        *(object_version('title', pk) for pk in titles),
+        *(object_version('review', pk) for pk in reviews)
+    )
+
+
+class UserViewSet(ServerTimingMixin, ModelViewSet):
     """
     Пользователи.
 
@@ -46,20 +69,34 @@ class UserViewSet(ModelViewSet):
     permission_classes = (IsAuthenticated, IsAdmin)
     http_method_names = ('get', 'post', 'path', 'delete', 'patch')
     lookup_field = 'username'
+    cursor_ordering = ('username',)
+
+    def perform_update(self, serializer):
+        username = serializer.instance.username
+        super().perform_update(serializer)
+        if serializer.instance.username != username:
+            bump_author_versions(serializer.instance)
+
+    def perform_destroy(self, instance):
+        # Отзывы и комментарии удаляются набором DELETE по подзапросу,
+        # рейтинги произведений поправляются одним UPDATE.
+        delete_users(User.objects.filter(pk=instance.pk))
 
     @action(detail=False,
             methods=['GET', 'PATCH'],
             permission_classes=(IsAuthenticated,))
     def me(self, request):
         if request.method == 'GET':
-            serializer = UserSerializer(request.user)
+            serializer = UserSerializer(request.user,
+                                        context={'request': request})
             return Response(serializer.data, status=HTTP_200_OK)
 
         serializer = UserMeSerializer(request.user,
                                       data=request.data,
-                                      partial=True)
+                                      partial=True,
+                                      context={'request': request})
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        self.perform_update(serializer)
         return Response(serializer.data, status=HTTP_200_OK)
 
 
@@ -96,5 +133,5 @@ class GetTokenView(TokenObtainPairView):
             username = serializer.validated_data['username']
             user = get_object_or_404(User, username=username)
             token = AccessToken.for_user(user)
-            return Response(token, status=HTTP_200_OK)
+            return Response({'token': str(token)}, status=HTTP_200_OK)
         return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
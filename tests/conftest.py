@@ -30,6 +30,22 @@ if FILENAME not in project_dir_content:
 
 assert get_version() < '4.0.0', 'Пожалуйста, используйте версию Django < 4.0.0'
 
+
+
+def pytest_configure(config):
+    from django.conf import settings
+
+    # Тесты не трогают кэш проекта в api_yamdb/cache/: метки версий
+    # и ответы живут в памяти процесса тестов.
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_cache',
+    'tests.fixtures.fixture_mail',
 ]
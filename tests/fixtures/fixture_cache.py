@@ -0,0 +1,15 @@
+import pytest
+from django.core.cache import cache
+
+from users.authentication import user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # База очищается между тестами в обход приложения,
+    # поэтому закэшированные ответы и метки версий сбрасываются.
+    cache.clear()
+    user_cache.clear()
+    yield
+    cache.clear()
+    user_cache.clear()
@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def inline_email_outbox(settings):
+    # Письма из очереди отправляются сразу после коммита,
+    # чтобы тесты видели их в mail.outbox.
+    settings.EMAIL_OUTBOX_DELIVERY = 'inline'
@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, client, admin_client,
+                                              admin, user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        assert self.get_rating(client, title_id) == 5
+
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'score': 9})
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что после изменения оценки в отзыве рейтинг '
+            'произведения пересчитывается.'
+        )
+
+        admin_client.delete(f'{url}{reviews[0]["id"]}/')
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что после удаления отзыва рейтинг произведения '
+            'пересчитывается.'
+        )
+
+        admin_client.delete(f'{url}{reviews[1]["id"]}/')
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что у произведения без отзывов рейтинг равен `None`.'
+        )
+
+    def test_02_rating_after_author_cascade(self, client, admin_client,
+                                            admin, user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        admin_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{user.reviews.get().id}/',
+            data={'score': 1}
+        )
+        assert self.get_rating(client, title_id) == 3
+
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что при каскадном удалении отзывов вместе с автором '
+            'рейтинг произведения пересчитывается.'
+        )
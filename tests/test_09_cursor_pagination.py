@@ -0,0 +1,132 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+from tests.utils import create_comments, create_reviews, create_titles
+from users.models import User
+
+
+def collect_pages(client, url):
+    results = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` в режиме курсоров '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в режиме курсоров ответ не содержит `count`.'
+        )
+        results.extend(data['results'])
+        url = data['next']
+    return results
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    def test_01_titles_cursor(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        results = collect_pages(client, '/api/v1/titles/?cursor=&limit=1')
+        assert [title['name'] for title in results] == sorted(
+            title['name'] for title in titles
+        ), (
+            'Проверьте, что в режиме курсоров `/api/v1/titles/` '
+            'возвращает все произведения, отсортированные по `name`.'
+        )
+
+    def test_02_reviews_and_comments_cursor(self, client, admin_client, admin,
+                                            user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        results = collect_pages(client, f'{url}?cursor=&limit=1')
+        assert [review['id'] for review in results] == sorted(
+            review['id'] for review in reviews
+        )
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        results = collect_pages(client, f'{url}?cursor=&limit=1')
+        assert [comment['id'] for comment in results] == sorted(
+            comment['id'] for comment in comments
+        )
+
+    def test_03_limit_offset_by_default(self, client, admin_client, admin):
+        create_reviews(admin_client, {admin: admin_client})
+        response = client.get('/api/v1/titles/?limit=1&offset=1')
+        data = response.json()
+        assert data['count'] == 2 and len(data['results']) == 1, (
+            'Проверьте, что без параметра `cursor` сохраняется пагинация '
+            'LimitOffset.'
+        )
+
+    def test_04_users_cursor(self, admin_client, admin, user):
+        results = collect_pages(admin_client, '/api/v1/users/?cursor=&limit=1')
+        assert [item['username'] for item in results] == sorted(
+            (admin.username, user.username)
+        )
+
+    def test_05_ties_without_offset(self, client, admin):
+        title = Title.objects.create(name='Произведение', year=2000)
+        for idx in range(5):
+            Title.objects.create(name='Дубль', year=2000)
+        users = [
+            User.objects.create_user(
+                username=f'reader{idx}', email=f'reader{idx}@yamdb.fake'
+            )
+            for idx in range(5)
+        ]
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Отзыв', score=5)
+            for author in users
+        )
+        # Как после import_csv: у всех отзывов одно время.
+        Review.objects.update(pub_date='2024-01-01T00:00Z')
+        for url, expected in (
+            ('/api/v1/titles/', list(
+                Title.objects.order_by('name', 'id').values_list(
+                    'id', flat=True
+                )
+            )),
+            (f'/api/v1/titles/{title.id}/reviews/', list(
+                Review.objects.order_by('id').values_list('id', flat=True)
+            )),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                results = collect_pages(client, f'{url}?cursor=&limit=2')
+            assert [item['id'] for item in results] == expected, (
+                f'Проверьте, что курсоры `{url}` не теряют и не повторяют '
+                'записи с одинаковым значением сортировки.'
+            )
+            assert not any(
+                'OFFSET' in query['sql'] for query in context.captured_queries
+            ), 'Проверьте, что страницы курсоров читаются без OFFSET.'
+
+    def test_06_previous_link(self, client):
+        for idx in range(5):
+            Title.objects.create(name='Дубль', year=2000)
+        url = '/api/v1/titles/?cursor=&limit=2'
+        first = client.get(url).json()
+        second = client.get(first['next']).json()
+        third = client.get(second['next']).json()
+        assert third['next'] is None
+        back = client.get(third['previous']).json()
+        assert back['results'] == second['results'], (
+            'Проверьте, что ссылка `previous` в режиме курсоров возвращает '
+            'предыдущую страницу.'
+        )
+
+    def test_07_name_index(self):
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется только для SQLite')
+        plan = Title.objects.filter(
+            is_deleted=False, name__gte='a'
+        ).order_by('name', 'id')[:10].explain()
+        assert 'title_name_id_idx' in plan and 'TEMP B-TREE' not in plan, (
+            'Проверьте, что страницы курсоров произведений читаются '
+            'по индексу без сортировки.'
+        )
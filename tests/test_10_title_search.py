@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from reviews.search import FTS_TABLE, fts_enabled
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleSearch:
+
+    def get_names(self, client, query):
+        response = client.get(f'/api/v1/titles/?{query}')
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_fts_index_in_sync(self, admin_client):
+        if not fts_enabled():
+            pytest.skip('SQLite собран без FTS5/trigram')
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s', ('name : "чужой"',)
+            )
+            assert cursor.fetchall() == [(titles[0]['id'],)], (
+                'Проверьте, что полнотекстовый индекс обновляется при '
+                'изменении и удалении произведений.'
+            )
+
+    def test_02_name_filter(self, client, admin_client):
+        create_titles(admin_client)
+        assert self.get_names(client, 'name=ОРЕШ') == ['Крепкий орешек'], (
+            'Проверьте, что фильтр `name` ищет подстроку без учёта регистра.'
+        )
+        assert self.get_names(client, 'name=ор') == [
+            'Крепкий орешек', 'Терминатор'
+        ], (
+            'Проверьте, что фильтр `name` работает и для коротких строк.'
+        )
+
+    def test_03_search(self, client, admin_client):
+        create_titles(admin_client)
+        assert self.get_names(client, 'search=back') == ['Терминатор'], (
+            'Проверьте, что параметр `search` ищет и по описанию.'
+        )
+        assert self.get_names(client, 'search=yay орешек') == [
+            'Крепкий орешек'
+        ]
+        assert self.get_names(client, 'search=нет-такого') == []
+
+    def test_04_name_filter_phrase(self, client):
+        Title.objects.create(name='Побег из Шоушенка', year=1994)
+        assert self.get_names(client, 'name=г из Ш') == [
+            'Побег из Шоушенка'
+        ]
+        assert self.get_names(client, 'name=Побег Шоушенка') == [], (
+            'Проверьте, что фильтр `name` ищет строку целиком, как '
+            '`icontains`, а не отдельные слова.'
+        )
+        assert self.get_names(client, 'name=из Побег') == []
+
+    def test_05_search_joins_index_once(self, client):
+        if not fts_enabled():
+            pytest.skip('SQLite собран без FTS5/trigram')
+        Title.objects.create(name='Крепкий орешек', year=1988)
+        with CaptureQueriesContext(connection) as context:
+            names = self.get_names(client, 'search=орешек')
+        assert names == ['Крепкий орешек']
+        queries = [query['sql'] for query in context.captured_queries]
+        page = next(sql for sql in queries if 'bm25' in sql)
+        assert page.count('MATCH') == 1, (
+            'Проверьте, что поиск присоединяет полнотекстовый индекс один '
+            'раз, а не выполняет MATCH для каждой строки.'
+        )
+        count = next(sql for sql in queries if 'COUNT(' in sql)
+        assert 'bm25' not in count, (
+            'Проверьте, что подсчёт страниц не вычисляет ранг.'
+        )
@@ -0,0 +1,55 @@
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    def test_01_anonymous_hit_skips_orm(self, client, admin_client,
+                                        django_assert_num_queries):
+        create_titles(admin_client)
+        url = '/api/v1/titles/?year=1984'
+        first = client.get(url)
+        with django_assert_num_queries(0):
+            second = client.get(url)
+        assert second.content == first.content, (
+            'Проверьте, что повторный анонимный GET-запрос к '
+            '`/api/v1/titles/` отдаётся из кэша без запросов к БД.'
+        )
+        for header in ('Content-Type', 'Vary', 'Allow', 'ETag'):
+            assert second.get(header) == first.get(header), (
+                f'Проверьте, что ответ из кэша содержит заголовок {header}.'
+            )
+
+    def test_02_writes_invalidate(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] is None
+        create_single_review(admin_client, titles[0]['id'], 'text', 8)
+        assert client.get(url).json()['rating'] == 8, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведений.'
+        )
+
+        admin_client.patch(url, data={'name': 'Новое имя'})
+        assert client.get(url).json()['name'] == 'Новое имя'
+
+        genres_url = '/api/v1/genres/'
+        count = client.get(genres_url).json()['count']
+        admin_client.post(genres_url, data={'name': 'Вестерн', 'slug': 'w'})
+        assert client.get(genres_url).json()['count'] == count + 1, (
+            'Проверьте, что новый жанр сбрасывает кэш жанров.'
+        )
+
+    def test_03_authenticated_not_cached(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        user_client.get(url)
+        admin_client.patch(
+            f'{url}{titles[0]["id"]}/', data={'description': 'new'}
+        )
+        descriptions = {
+            title['id']: title['description']
+            for title in user_client.get(url).json()['results']
+        }
+        assert descriptions[titles[0]['id']] == 'new'
@@ -0,0 +1,114 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ETag:
+
+    def test_01_not_modified(self, user_client, admin_client, admin,
+                             django_assert_num_queries):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        urls = (
+            title_url,
+            f'{title_url}reviews/',
+            f'{title_url}reviews/{reviews[0]["id"]}/comments/',
+            '/api/v1/genres/',
+            '/api/v1/categories/',
+        )
+        for url in urls:
+            response = user_client.get(url)
+            etag = response.get('ETag')
+            assert etag, (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит ETag.'
+            )
+            with django_assert_num_queries(0):
+                response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+                'If-None-Match возвращает 304 без запросов к БД.'
+            )
+
+    def test_02_etag_changes_on_write(self, user_client, admin_client, admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/'
+        )
+        etag = user_client.get(url)['ETag']
+        admin_client.patch(f'{url}{comments[0]["id"]}/', data={'text': 'new'})
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response['ETag'] != etag, (
+            'Проверьте, что изменение комментария меняет ETag списка.'
+        )
+
+        etag = response['ETag']
+        admin_client.patch('/api/v1/users/me/', data={'username': 'renamed'})
+        assert user_client.get(url)['ETag'] != etag, (
+            'Проверьте, что смена username автора меняет ETag списка '
+            'комментариев.'
+        )
+
+    def test_03_wildcard_does_not_hide_404(self, client):
+        for url in ('/api/v1/titles/99999/', '/api/v1/titles/99999/reviews/'):
+            response = client.get(url, HTTP_IF_NONE_MATCH='*')
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` с If-None-Match: * '
+                'возвращает 404 для несуществующего ресурса.'
+            )
+
+    def test_04_etag_per_parent(self, user_client, admin_client, admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        urls = (
+            title_url,
+            f'{title_url}reviews/',
+            f'{title_url}reviews/{reviews[0]["id"]}/comments/',
+        )
+        etags = {url: user_client.get(url)['ETag'] for url in urls}
+        create_single_review(user_client, titles[1]['id'], 'Отзыв', 7)
+        user_client.patch('/api/v1/users/me/', data={'bio': 'О себе'})
+        for url in urls:
+            response = user_client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что ETag `{url}` не меняется от отзыва к '
+                'другому произведению и правки профиля без смены username.'
+            )
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 3)
+        for url in urls[:2]:
+            response = user_client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что новый отзыв к произведению меняет ETag '
+                f'`{url}`.'
+            )
+        response = user_client.get(urls[2], HTTP_IF_NONE_MATCH=etags[urls[2]])
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что новый отзыв не меняет ETag комментариев к '
+            'другому отзыву.'
+        )
+
+        admin_client.patch(
+            f'{title_url}reviews/{reviews[0]["id"]}/', data={'text': 'new'}
+        )
+        response = user_client.get(urls[2], HTTP_IF_NONE_MATCH=etags[urls[2]])
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что правка отзыва меняет ETag комментариев к нему.'
+        )
+        etag = response['ETag']
+        admin_client.delete(title_url)
+        response = user_client.get(urls[2], HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что после удаления произведения ветка комментариев '
+            'его отзыва не отвечает 304 по старому ETag.'
+        )
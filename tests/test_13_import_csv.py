@@ -0,0 +1,46 @@
+import csv
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Avg
+
+from reviews.models import Comment, Review, Title, TitleGenre
+from tests.conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(filename):
+    with open(os.path.join(DATA_PATH, filename), encoding='utf-8') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ImportCsv:
+
+    def test_01_import(self):
+        out = StringIO()
+        call_command('import_csv', '--batch-size', '10', stdout=out)
+        assert 'строк/с' in out.getvalue()
+        for filename, model in (
+            ('titles.csv', Title),
+            ('genre_title.csv', TitleGenre),
+            ('review.csv', Review),
+            ('comments.csv', Comment),
+        ):
+            assert model.objects.count() == count_rows(filename), (
+                f'Проверьте, что команда `import_csv` загружает `{filename}`.'
+            )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что `import_csv` сохраняет `pub_date` из CSV.'
+        )
+        for title in Title.objects.filter(review_count__gt=0):
+            assert title.rating == title.reviews.aggregate(
+                rating=Avg('score')
+            )['rating'], (
+                'Проверьте, что после загрузки отзывов пересчитывается '
+                'рейтинг произведений.'
+            )
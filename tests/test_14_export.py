@@ -0,0 +1,78 @@
+import csv
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+
+from tests.utils import create_comments
+
+
+def read_content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Export:
+
+    def test_01_permissions(self, client, user_client):
+        url = '/api/v1/export/reviews/'
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что выгрузка `{url}` доступна только администратору.'
+        )
+
+    def test_02_ndjson_and_csv(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        response = admin_client.get('/api/v1/export/reviews/?type=ndjson')
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоком.'
+        )
+        rows = [json.loads(line) for line in read_content(response).splitlines()]
+        assert [row['id'] for row in rows] == [
+            review['id'] for review in reviews
+        ]
+        assert rows[0]['author'] == admin.username
+
+        response = admin_client.get('/api/v1/export/comments/?type=csv')
+        rows = list(csv.DictReader(StringIO(read_content(response))))
+        assert [int(row['id']) for row in rows] == [
+            comment['id'] for comment in comments
+        ]
+
+        response = admin_client.get('/api/v1/export/titles/')
+        assert len(read_content(response).splitlines()) == len(titles)
+
+    def test_03_unknown(self, admin_client):
+        assert admin_client.get(
+            '/api/v1/export/users/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert admin_client.get(
+            '/api/v1/export/titles/?type=xml'
+        ).status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_soft_deleted_titles(self, admin_client, admin):
+        _, _, titles = create_comments(admin_client, {admin: admin_client})
+        deleted = titles[0]['id']
+        admin_client.delete(f'/api/v1/titles/{deleted}/')
+
+        def export(name):
+            response = admin_client.get(f'/api/v1/export/{name}/')
+            return [
+                json.loads(line)
+                for line in read_content(response).splitlines()
+            ]
+
+        assert deleted not in [row['id'] for row in export('titles')], (
+            'Проверьте, что выгрузка не содержит удалённых произведений.'
+        )
+        assert export('titles'), (
+            'Проверьте, что остальные произведения остаются в выгрузке.'
+        )
+        assert export('reviews') == [] and export('comments') == [], (
+            'Проверьте, что выгрузка не содержит отзывов и комментариев '
+            'удалённых произведений.'
+        )
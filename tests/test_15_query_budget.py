@@ -0,0 +1,164 @@
+import re
+import time
+
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.urls import v1_router
+from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+
+PAGE_SIZES = (10, 100)
+ROWS = 110
+# Максимум SQL-запросов на один запрос к эндпоинту.
+QUERY_BUDGET = 6
+# В тестах письмо уходит сразу после коммита (inline), а захват письма
+# перед отправкой — отдельный UPDATE.
+SIGNUP_QUERY_BUDGET = QUERY_BUDGET + 1
+# Максимум времени на один запрос к эндпоинту, секунд.
+TIME_BUDGET = 1.0
+# Дополнительные параметры для действий, которым они обязательны.
+ACTION_PARAMS = {
+    'autocomplete': 'q=произв',
+}
+
+
+def create(model, objects):
+    """bulk_create; на SQLite id созданных строк приходится перечитать."""
+    model.objects.bulk_create(objects)
+    return list(model.objects.order_by('id'))
+
+
+@pytest.fixture
+def dataset(admin, django_user_model):
+    create(django_user_model, (
+        django_user_model(
+            username=f'user{idx}',
+            email=f'user{idx}@yamdb.fake',
+            password=make_password(None)
+        )
+        for idx in range(ROWS)
+    ))
+    users = list(django_user_model.objects.exclude(pk=admin.pk))
+    categories = create(Category, (
+        Category(name=f'Категория {idx}', slug=f'cat{idx}')
+        for idx in range(3)
+    ))
+    genres = create(Genre, (
+        Genre(name=f'Жанр {idx}', slug=f'genre{idx}') for idx in range(5)
+    ))
+    titles = create(Title, (
+        Title(
+            name=f'Произведение {idx:03}',
+            year=1900 + idx,
+            category=categories[idx % len(categories)]
+        )
+        for idx in range(ROWS)
+    ))
+    TitleGenre.objects.bulk_create(
+        TitleGenre(title=title, genre=genres[(idx + shift) % len(genres)])
+        for idx, title in enumerate(titles)
+        for shift in range(2)
+    )
+    reviews = create(Review, (
+        Review(title=titles[0], author=user, text='Отзыв', score=7)
+        for user in users
+    ))
+    Comment.objects.bulk_create(
+        Comment(review=reviews[0], author=user, text='Комментарий')
+        for user in users
+    )
+    return {
+        'title_id': titles[0].id,
+        'review_id': reviews[0].id,
+        'title': titles[0].id,
+        'reviews': reviews[0].id,
+        'comments': reviews[0].comments.first().id,
+        'genres': genres[0].slug,
+        'categories': categories[0].slug,
+        'users': users[0].username,
+    }
+
+
+def build_routes(ids):
+    """Все GET-маршруты v1_router: список, объект и действия."""
+    routes = []
+    for prefix, viewset, basename in v1_router.registry:
+        url = '/api/v1/' + re.sub(
+            r'\(\?P<(\w+)>[^)]+\)',
+            lambda match: str(ids[match.group(1)]),
+            prefix
+        ) + '/'
+        routes.append(f'{url}?')
+        if hasattr(viewset, 'retrieve'):
+            routes.append(f'{url}{ids[basename]}/?')
+        for action in viewset.get_extra_actions():
+            if 'get' in action.mapping and not action.detail:
+                params = ACTION_PARAMS.get(action.url_path, '')
+                routes.append(f'{url}{action.url_path}/?{params}&')
+    return routes
+
+
+def measure(client, url):
+    with CaptureQueriesContext(connection) as context:
+        started = time.monotonic()
+        response = client.get(url)
+        elapsed = time.monotonic() - started
+    assert response.status_code == 200, (
+        f'GET-запрос к `{url}` вернул {response.status_code}.'
+    )
+    return len(context), elapsed
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15QueryBudget:
+
+    def test_01_router_budgets(self, admin_client, dataset):
+        routes = build_routes(dataset)
+        # Прогрев: пользователь токена попадает в кэш аутентификации,
+        # справочники и названия — в индексы процесса.
+        for url in routes:
+            admin_client.get(url)
+        for url in routes:
+            counts = []
+            for page_size in PAGE_SIZES:
+                page_url = f'{url}limit={page_size}'
+                queries, elapsed = measure(admin_client, page_url)
+                assert queries <= QUERY_BUDGET, (
+                    f'GET-запрос к `{page_url}` выполнил {queries} '
+                    f'SQL-запросов при бюджете {QUERY_BUDGET}.'
+                )
+                assert elapsed <= TIME_BUDGET, (
+                    f'GET-запрос к `{page_url}` занял {elapsed:.3f} с '
+                    f'при бюджете {TIME_BUDGET} с.'
+                )
+                counts.append(queries)
+            assert len(set(counts)) == 1, (
+                f'Число SQL-запросов к `{url}` растёт с размером страницы: '
+                f'{dict(zip(PAGE_SIZES, counts))}.'
+            )
+
+    def test_02_auth_budgets(self, client, dataset, django_user_model):
+        user = django_user_model.objects.get(username=dataset['users'])
+        data = {'username': user.username, 'email': user.email}
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == 200
+        assert len(context) <= SIGNUP_QUERY_BUDGET, (
+            f'POST-запрос к `/api/v1/auth/signup/` выполнил {len(context)} '
+            f'SQL-запросов при бюджете {SIGNUP_QUERY_BUDGET}.'
+        )
+
+        user.refresh_from_db()
+        data = {
+            'username': user.username,
+            'confirmation_code': user.confirmation_code
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/api/v1/auth/token/', data=data)
+        assert response.status_code == 200
+        assert len(context) <= QUERY_BUDGET, (
+            f'POST-запрос к `/api/v1/auth/token/` выполнил {len(context)} '
+            f'SQL-запросов при бюджете {QUERY_BUDGET}.'
+        )
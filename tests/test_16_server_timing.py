@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ServerTiming:
+
+    def test_01_header(self, client, user_client):
+        response = client.get('/api/v1/titles/')
+        header = response.get('Server-Timing', '')
+        for metric in ('db;', 'app;', 'render;', 'total;'):
+            assert metric in header, (
+                'Проверьте, что ответ содержит заголовок `Server-Timing` '
+                f'с метрикой `{metric[:-1]}`.'
+            )
+        response = user_client.get(
+            '/api/v1/titles/', HTTP_X_SERVER_TIMING_DETAIL='1'
+        )
+        assert 'Server-Timing-Detail' not in response, (
+            'Проверьте, что список медленных запросов доступен только '
+            'администратору.'
+        )
+
+    def test_02_admin_detail(self, admin_client):
+        response = admin_client.get(
+            '/api/v1/titles/', HTTP_X_SERVER_TIMING_DETAIL='1'
+        )
+        detail = json.loads(response['Server-Timing-Detail'])
+        assert detail and all('sql' in item for item in detail)
+
+    def test_03_phases(self, user_client):
+        response = user_client.get('/api/v1/titles/')
+        header = response.get('Server-Timing', '')
+        for metric in ('auth;', 'permissions;', 'serialize;'):
+            assert metric in header, (
+                'Проверьте, что аутентификация, проверка прав и '
+                'serializer.data идут отдельными метриками `Server-Timing`.'
+            )
+        response = user_client.get('/api/v1/users/me/')
+        assert 'serialize;' in response.get('Server-Timing', ''), (
+            'Проверьте, что `/users/me/` тоже пишет метрику `serialize`.'
+        )
@@ -0,0 +1,39 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17UserCache:
+
+    def test_01_cached_auth(self, user_client):
+        user_client.get('/api/v1/users/me/')
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert len(context) == 0, (
+            'Проверьте, что повторная аутентификация по токену не '
+            'обращается к БД.'
+        )
+
+    def test_02_role_change_invalidates(self, admin_client, user_client,
+                                        user):
+        assert user_client.get(
+            '/api/v1/users/'
+        ).status_code == HTTPStatus.FORBIDDEN
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert user_client.get('/api/v1/users/').status_code == HTTPStatus.OK, (
+            'Проверьте, что смена роли пользователя сбрасывает кэш '
+            'аутентификации.'
+        )
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert user_client.get(
+            '/api/v1/users/me/'
+        ).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что удалённый пользователь не аутентифицируется '
+            'из кэша.'
+        )
@@ -0,0 +1,107 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+from users.outbox import claim_batch, executor, send_pending
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18EmailOutbox:
+
+    def test_01_signup_queues_email(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        outbox_before_count = len(mail.outbox)
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что регистрация не отправляет письмо синхронно.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == data['email'] and email.sent_at is None
+
+        call_command('send_outbox', stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `send_outbox` отправляет письма '
+            'из очереди.'
+        )
+        assert data['email'] in mail.outbox[-1].to
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 1
+
+    def test_02_batches(self, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        OutgoingEmail.objects.bulk_create(
+            OutgoingEmail(
+                recipient=f'user{idx}@yamdb.fake', subject='s', body='b'
+            )
+            for idx in range(5)
+        )
+        outbox_before_count = len(mail.outbox)
+        call_command('send_outbox', '--batch-size', '2', stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 5
+        assert not OutgoingEmail.objects.filter(sent_at__isnull=True)
+
+    def test_03_background_thread(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'thread'
+        outbox_before_count = len(mail.outbox)
+        data = {'email': 'thread@yamdb.fake', 'username': 'thread'}
+        client.post('/api/v1/auth/signup/', data=data)
+        # Исполнитель однопоточный: пустая задача дождётся отправки.
+        executor.submit(lambda: None).result(timeout=10)
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что письма из очереди отправляются фоновым потоком.'
+        )
+
+    def test_04_failed_send_is_postponed(self, settings, monkeypatch):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        email = OutgoingEmail.objects.create(
+            recipient='retry@yamdb.fake', subject='s', body='b'
+        )
+
+        def fail(self, messages):
+            raise ConnectionError('SMTP недоступен')
+
+        with monkeypatch.context() as patch:
+            patch.setattr(locmem.EmailBackend, 'send_messages', fail)
+            assert send_pending() == 0
+            assert send_pending() == 0
+        email.refresh_from_db()
+        assert email.attempts == 1 and email.sent_at is None, (
+            'Проверьте, что неудачная отправка откладывается, а не '
+            'повторяется сразу.'
+        )
+        assert email.next_attempt_at > timezone.now()
+        assert 'SMTP' in email.last_error
+
+        assert send_pending() == 0
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        assert send_pending() == 1, (
+            'Проверьте, что отложенное письмо отправляется после паузы.'
+        )
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 2
+
+    def test_05_claimed_emails_are_not_sent_twice(self, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        OutgoingEmail.objects.bulk_create(
+            OutgoingEmail(
+                recipient=f'user{idx}@yamdb.fake', subject='s', body='b'
+            )
+            for idx in range(3)
+        )
+        claimed = claim_batch(2)
+        assert len(claimed) == 2
+        outbox_before_count = len(mail.outbox)
+        assert send_pending() == 1, (
+            'Проверьте, что письма, взятые другим отправителем, не '
+            'отправляются повторно.'
+        )
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert send_pending() == 0
@@ -0,0 +1,62 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19UserLookups:
+
+    def test_01_signup_case_insensitive(self, client, user):
+        data = {'username': user.username.upper(), 'email': 'other@yamdb.fake'}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что регистрация с username, отличающимся только '
+            'регистром, запрещена.'
+        )
+        data = {'username': 'other', 'email': user.email.upper()}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_admin_create_case_insensitive(self, admin_client, user):
+        data = {'username': user.username.lower(), 'email': 'new@yamdb.fake'}
+        response = admin_client.post('/api/v1/users/', data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что администратор не может создать пользователя '
+            'с username, отличающимся только регистром.'
+        )
+
+    def test_03_lookup_uses_index(self, user):
+        assert User.objects.get(username_lower='testuser') == user
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется только для SQLite')
+        plan = User.objects.filter(email_lower='x').explain()
+        assert 'SEARCH' in plan and 'email_lower' in plan, (
+            'Проверьте, что поиск по email без учёта регистра идёт по индексу.'
+        )
+
+    def test_04_save_keeps_unresolved_clashes(self, admin_client, user):
+        # Так миграция 0003 оставляет пользователя, чей username или
+        # email совпал с более ранним без учёта регистра.
+        clash = User.objects.create_user(
+            username='clash', email='clash@yamdb.fake'
+        )
+        User.objects.filter(pk=clash.pk).update(
+            username=user.username.upper(), email=user.email.upper(),
+            username_lower=None, email_lower=None
+        )
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username.upper()}/', data={'bio': 'new'}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что сохранение пользователя без смены username '
+            'и email не пересчитывает их копии в нижнем регистре.'
+        )
+        clash = User.objects.get(pk=clash.pk)
+        assert (clash.bio, clash.username_lower) == ('new', None)
+
+        clash.username = 'resolved'
+        clash.save()
+        assert User.objects.get(pk=clash.pk).username_lower == 'resolved'
@@ -0,0 +1,112 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import TitleSerializer
+from reviews.models import Category, Genre, Review, Title
+
+
+def write_queries(client, method, url, genres):
+    data = {
+        'name': 'Произведение',
+        'year': 2000,
+        'genre': [genre.slug for genre in genres],
+        'category': 'cat',
+    }
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(
+            url, data=data, format='json'
+        )
+    assert response.status_code in (HTTPStatus.OK, HTTPStatus.CREATED), (
+        f'Запрос к `{url}` вернул {response.status_code}.'
+    )
+    return len(context), response
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitleWrite:
+
+    def test_01_constant_queries(self, admin_client):
+        Category.objects.create(name='Категория', slug='cat')
+        genres = [
+            Genre.objects.create(name=f'Жанр {idx}', slug=f'genre{idx}')
+            for idx in range(20)
+        ]
+        # Прогрев: кэш аутентификации и снимки справочников.
+        admin_client.get('/api/v1/users/me/')
+        write_queries(admin_client, 'post', '/api/v1/titles/', genres[:1])
+        small, _ = write_queries(
+            admin_client, 'post', '/api/v1/titles/', genres[:1]
+        )
+        large, response = write_queries(
+            admin_client, 'post', '/api/v1/titles/', genres
+        )
+        assert small == large, (
+            'Проверьте, что число SQL-запросов при создании произведения '
+            f'не зависит от числа жанров: {small} и {large}.'
+        )
+        title = Title.objects.get(pk=response.json()['id'])
+        assert title.genre.count() == len(genres)
+
+        url = f'/api/v1/titles/{title.id}/'
+        write_queries(admin_client, 'patch', url, genres[:2])
+        small, _ = write_queries(admin_client, 'patch', url, genres[2:4])
+        large, _ = write_queries(admin_client, 'patch', url, genres[5:])
+        assert small == large, (
+            'Проверьте, что число SQL-запросов при изменении произведения '
+            f'не зависит от числа жанров: {small} и {large}.'
+        )
+        assert set(title.genre.values_list('slug', flat=True)) == {
+            genre.slug for genre in genres[5:]
+        }
+
+    def test_02_unknown_slug(self, admin_client):
+        Category.objects.create(name='Категория', slug='cat')
+        genre = Genre.objects.create(name='Жанр', slug='genre')
+        response = admin_client.post(
+            '/api/v1/titles/',
+            data={
+                'name': 'Произведение',
+                'year': 2000,
+                'genre': [genre.slug, 'missing'],
+                'category': 'cat',
+            },
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неизвестный slug жанра возвращает ошибку 400.'
+        )
+        assert 'genre' in response.json()
+        assert not Title.objects.exists()
+
+    def test_03_patch_keeps_concurrent_writes(self, admin_client, admin,
+                                              monkeypatch):
+        title = Title.objects.create(name='Произведение', year=2000)
+        update = TitleSerializer.update
+
+        def concurrent_update(serializer, instance, validated_data):
+            # Пока PATCH держит прочитанный экземпляр, приходят отзыв
+            # и мягкое удаление.
+            Review.objects.create(
+                title=title, author=admin, text='Отзыв', score=8
+            )
+            Title.objects.filter(pk=title.pk).update(is_deleted=True)
+            return update(serializer, instance, validated_data)
+
+        monkeypatch.setattr(TitleSerializer, 'update', concurrent_update)
+        response = admin_client.patch(
+            f'/api/v1/titles/{title.id}/',
+            data={'name': 'Новое название'},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        title.refresh_from_db()
+        assert title.name == 'Новое название'
+        assert (title.review_count, title.rating, title.is_deleted) == (
+            1, 8.0, True
+        ), (
+            'Проверьте, что изменение произведения пишет только переданные '
+            'поля и не затирает агрегаты отзывов и is_deleted.'
+        )
@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ReferenceSnapshot:
+
+    def test_01_list_without_reference_joins(self, client):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(name='Фильм', year=2000,
+                                     category=category)
+        title.genre.add(genre)
+        client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/?genre=drama&category=movie')
+        assert response.status_code == HTTPStatus.OK
+        result = response.json()['results']
+        assert result[0]['genre'] == [{'name': 'Драма', 'slug': 'drama'}]
+        assert result[0]['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        tables = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'reviews_genre"' not in tables, (
+            'Проверьте, что жанры списка произведений берутся из снимка, '
+            'а не из таблицы жанров.'
+        )
+        assert 'reviews_category"' not in tables, (
+            'Проверьте, что категории списка произведений берутся из '
+            'снимка, а не из таблицы категорий.'
+        )
+
+    def test_02_write_refreshes_snapshot(self, admin_client):
+        assert admin_client.get(
+            '/api/v1/titles/?genre=comedy'
+        ).json()['results'] == []
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Комедия', 'slug': 'comedy'}
+        )
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'movie'}
+        )
+        response = admin_client.post(
+            '/api/v1/titles/',
+            data={'name': 'Фильм', 'year': 2000,
+                  'genre': ['comedy'], 'category': 'movie'},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что новый жанр сразу доступен при создании '
+            'произведения.'
+        )
+        Genre.objects.filter(slug='comedy').update(name='Комедия положений')
+        Genre.objects.get(slug='comedy').save()
+        result = admin_client.get('/api/v1/titles/?genre=comedy').json()
+        assert result['results'][0]['genre'] == [
+            {'name': 'Комедия положений', 'slug': 'comedy'}
+        ], (
+            'Проверьте, что изменение жанра обновляет снимок справочника.'
+        )
@@ -0,0 +1,45 @@
+import pytest
+from django.db import IntegrityError, connection, transaction
+
+from reviews.models import Comment, Genre, Review, Title, TitleGenre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Indexes:
+
+    def test_01_title_genre_unique(self):
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(name='Фильм', year=2000)
+        TitleGenre.objects.create(title=title, genre=genre)
+        with pytest.raises(IntegrityError), transaction.atomic():
+            TitleGenre.objects.create(title=title, genre=genre)
+
+    def test_02_genre_filter_plan(self):
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется только для SQLite')
+        plan = TitleGenre.objects.filter(genre_id=1).values(
+            'title_id'
+        ).explain()
+        assert 'titlegenre_genre_title_idx' in plan, (
+            'Проверьте, что выборка произведений по жанру идёт по '
+            'составному индексу (genre, title).'
+        )
+        assert 'TEMP B-TREE' not in plan
+
+    def test_03_listing_plans(self):
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется только для SQLite')
+        for queryset, index in (
+            (Review.objects.filter(title_id=1), 'review_title_pub_date_idx'),
+            (Comment.objects.filter(review_id=1),
+             'comment_review_pub_date_idx'),
+        ):
+            plan = queryset.explain()
+            assert index in plan, (
+                f'Проверьте, что выборка `{queryset.model.__name__}` '
+                f'идёт по индексу {index}.'
+            )
+            assert 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что выборка `{queryset.model.__name__}` '
+                'не сортируется в памяти.'
+            )
@@ -0,0 +1,102 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Genre, Review, Title, TitleGenre
+
+
+def create_users(django_user_model, prefix, count):
+    django_user_model.objects.bulk_create(
+        django_user_model(
+            username=f'{prefix}{idx}',
+            email=f'{prefix}{idx}@yamdb.fake',
+            password=make_password(None)
+        )
+        for idx in range(count)
+    )
+    return list(
+        django_user_model.objects.filter(username__startswith=prefix)
+    )
+
+
+def fill_title(title, users):
+    Review.objects.bulk_create(
+        Review(title=title, author=user, text='Отзыв', score=5)
+        for user in users
+    )
+    Comment.objects.bulk_create(
+        Comment(review=review, author=user, text='Комментарий')
+        for review in Review.objects.filter(title=title)
+        for user in users[:3]
+    )
+
+
+def delete_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.delete(url)
+    assert response.status_code == HTTPStatus.NO_CONTENT, (
+        f'DELETE-запрос к `{url}` вернул {response.status_code}.'
+    )
+    return len(context)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23BulkDelete:
+
+    def test_01_title_delete(self, admin_client, django_user_model):
+        users = create_users(django_user_model, 'reader', 30)
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        small = Title.objects.create(name='Малое', year=2000)
+        large = Title.objects.create(name='Большое', year=2000)
+        small.genre.add(genre)
+        large.genre.add(genre)
+        fill_title(small, users[:2])
+        fill_title(large, users)
+        admin_client.get('/api/v1/users/me/')
+        counts = [
+            delete_queries(admin_client, f'/api/v1/titles/{title.id}/')
+            for title in (small, large)
+        ]
+        assert counts[0] == counts[1], (
+            'Проверьте, что число SQL-запросов при удалении произведения '
+            f'не зависит от числа отзывов: {counts}.'
+        )
+        call_command('purge_deleted', batch_size=10, stdout=StringIO())
+        assert not Title.objects.exists()
+        assert not Review.objects.exists()
+        assert not Comment.objects.exists()
+        assert not TitleGenre.objects.exists()
+
+    def test_02_user_delete(self, admin_client, django_user_model):
+        author, reader = create_users(django_user_model, 'member', 2)
+        titles = [
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+            for idx in range(3)
+        ]
+        for title in titles:
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=10
+            )
+            review = Review.objects.create(
+                title=title, author=reader, text='Отзыв', score=4
+            )
+            Comment.objects.create(
+                review=review, author=author, text='Комментарий'
+            )
+        admin_client.get('/api/v1/users/me/')
+        delete_queries(admin_client, f'/api/v1/users/{author.username}/')
+        assert not Review.objects.filter(author=author).exists()
+        assert not Comment.objects.filter(author=author).exists()
+        for title in Title.objects.all():
+            assert (title.score_sum, title.review_count) == (4, 1), (
+                'Проверьте, что удаление пользователя поправляет агрегаты '
+                'произведений.'
+            )
+            assert title.rating == 4
+        response = admin_client.get(f'/api/v1/titles/{titles[0].id}/')
+        assert response.json()['rating'] == 4
@@ -0,0 +1,78 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Genre, Review, Title, TitleGenre
+
+
+@pytest.fixture
+def catalog(admin):
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    title = Title.objects.create(name='Фильм', year=2000, category=category)
+    title.genre.add(genre)
+    Review.objects.create(title=title, author=admin, text='Отзыв', score=5)
+    return title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24SoftDelete:
+
+    def test_01_hidden_after_delete(self, admin_client, catalog):
+        admin_client.delete('/api/v1/genres/drama/')
+        admin_client.delete('/api/v1/categories/movie/')
+        result = admin_client.get(f'/api/v1/titles/{catalog.id}/').json()
+        assert result['genre'] == [] and result['category'] is None, (
+            'Проверьте, что удалённые жанр и категория сразу пропадают из '
+            'выдачи произведения.'
+        )
+        assert admin_client.get('/api/v1/genres/').json()['results'] == []
+        assert admin_client.get('/api/v1/titles/?genre=drama').json()[
+            'results'] == []
+
+        response = admin_client.delete(f'/api/v1/titles/{catalog.id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert admin_client.get('/api/v1/titles/').json()['results'] == []
+        assert admin_client.get(
+            f'/api/v1/titles/{catalog.id}/reviews/'
+        ).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что отзывы удалённого произведения недоступны.'
+        )
+        assert Title.objects.filter(pk=catalog.id).exists(), (
+            'Проверьте, что DELETE только помечает произведение удалённым.'
+        )
+
+    def test_02_slug_reuse(self, admin_client, catalog):
+        admin_client.delete('/api/v1/genres/drama/')
+        response = admin_client.post(
+            '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что slug удалённого жанра можно занять снова.'
+        )
+        response = admin_client.post(
+            '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_purge(self, admin_client, catalog):
+        TitleGenre.objects.create(title=catalog, genre=None)
+        admin_client.delete('/api/v1/genres/drama/')
+        admin_client.delete('/api/v1/categories/movie/')
+        out = StringIO()
+        call_command('purge_deleted', batch_size=1, stdout=out)
+        catalog.refresh_from_db()
+        assert catalog.category is None
+        assert not TitleGenre.objects.exists(), (
+            'Проверьте, что purge_deleted удаляет связи с удалёнными '
+            'жанрами и связи без жанра.'
+        )
+        assert not Genre.objects.exists() and not Category.objects.exists()
+        assert 'Очистка завершена' in out.getvalue()
+
+        admin_client.delete(f'/api/v1/titles/{catalog.id}/')
+        call_command('purge_deleted', stdout=StringIO())
+        assert not Title.objects.exists()
+        assert not Review.objects.exists()
@@ -0,0 +1,84 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+
+
+def rebuild(*args):
+    out = StringIO()
+    call_command('rebuild_aggregates', '--batch-size', '2', *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25RebuildAggregates:
+
+    def test_01_fix_drift(self, admin):
+        titles = [
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+            for idx in range(5)
+        ]
+        for title in titles:
+            Review.objects.create(
+                title=title, author=admin, text='Отзыв', score=6
+            )
+        Title.objects.filter(pk__in=[titles[1].pk, titles[4].pk]).update(
+            score_sum=100, review_count=7, rating=1.5
+        )
+        Title.objects.filter(pk=titles[2].pk).update(rating=None)
+
+        out = rebuild('--dry-run')
+        assert 'найдено расхождений: 3' in out, (
+            'Проверьте, что `rebuild_aggregates --dry-run` находит '
+            'расхождения.'
+        )
+        assert Title.objects.get(pk=titles[1].pk).score_sum == 100, (
+            'Проверьте, что `--dry-run` ничего не меняет.'
+        )
+
+        out = rebuild()
+        assert 'исправлено расхождений: 3' in out
+        for title in Title.objects.all():
+            assert (title.score_sum, title.review_count, title.rating) == (
+                6, 1, 6.0
+            ), 'Проверьте, что `rebuild_aggregates` исправляет агрегаты.'
+        assert 'исправлено расхождений: 0' in rebuild()
+
+    def test_02_since(self, admin):
+        old, new = (
+            Title.objects.create(name=name, year=2000)
+            for name in ('Старое', 'Новое')
+        )
+        Review.objects.create(title=old, author=admin, text='Отзыв', score=3)
+        Review.objects.filter(title=old).update(pub_date='2001-01-01T00:00Z')
+        Review.objects.create(title=new, author=admin, text='Отзыв', score=3)
+        Title.objects.update(review_count=5)
+        out = rebuild('--since', '2020-01-01')
+        assert 'Проверено произведений: 1' in out, (
+            'Проверьте, что `--since` проверяет только произведения '
+            'с новыми отзывами.'
+        )
+        assert Title.objects.get(pk=new.pk).review_count == 1
+        assert Title.objects.get(pk=old.pk).review_count == 5
+
+    def test_03_since_scans_reviews_once(self, admin):
+        for idx in range(5):
+            title = Title.objects.create(name=f'Произведение {idx}', year=2000)
+            Review.objects.create(
+                title=title, author=admin, text='Отзыв', score=4
+            )
+        with CaptureQueriesContext(connection) as context:
+            out = rebuild('--since', '2020-01-01')
+        assert 'Проверено произведений: 5' in out
+        scans = [
+            query for query in context.captured_queries
+            if '"pub_date" >=' in query['sql']
+        ]
+        assert len(scans) == 1, (
+            'Проверьте, что `--since` выбирает произведения со свежими '
+            'отзывами одним запросом, а не в каждой пачке.'
+        )
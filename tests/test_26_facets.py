@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.fixture
+def catalog():
+    movie = Category.objects.create(name='Фильм', slug='movie')
+    book = Category.objects.create(name='Книга', slug='book')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    for name, year, category, genres in (
+        ('Первое', 1985, movie, (drama,)),
+        ('Второе', 1989, movie, (drama, comedy)),
+        ('Третье', 1994, book, (comedy,)),
+    ):
+        title = Title.objects.create(name=name, year=year, category=category)
+        title.genre.set(genres)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Facets:
+
+    def test_01_counts(self, client, catalog):
+        response = client.get('/api/v1/titles/facets/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что эндпоинт `/api/v1/titles/facets/` доступен '
+            'без токена.'
+        )
+        assert response.json() == {
+            'genre': [
+                {'name': 'Драма', 'slug': 'drama', 'count': 2},
+                {'name': 'Комедия', 'slug': 'comedy', 'count': 2},
+            ],
+            'category': [
+                {'name': 'Книга', 'slug': 'book', 'count': 1},
+                {'name': 'Фильм', 'slug': 'movie', 'count': 2},
+            ],
+            'decade': [
+                {'decade': 1980, 'count': 2},
+                {'decade': 1990, 'count': 1},
+            ],
+        }
+
+    def test_02_filters_and_cache(self, admin_client, catalog):
+        admin_client.get('/api/v1/titles/facets/')
+        url = '/api/v1/titles/facets/?category=movie'
+        data = admin_client.get(url).json()
+        assert data['genre'] == [
+            {'name': 'Драма', 'slug': 'drama', 'count': 2},
+            {'name': 'Комедия', 'slug': 'comedy', 'count': 1},
+        ], 'Проверьте, что фасеты учитывают фильтры списка произведений.'
+        assert data['decade'] == [{'decade': 1980, 'count': 2}]
+
+        with CaptureQueriesContext(connection) as context:
+            assert admin_client.get(url).json() == data
+        assert len(context) == 0, (
+            'Проверьте, что фасеты кэшируются по параметрам фильтра.'
+        )
+        admin_client.delete(
+            f'/api/v1/titles/{Title.objects.get(name="Первое").id}/'
+        )
+        assert admin_client.get(url).json()['decade'] == [
+            {'decade': 1980, 'count': 1}
+        ], 'Проверьте, что изменение произведений сбрасывает кэш фасетов.'
@@ -0,0 +1,117 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import autocomplete
+from reviews.models import Title
+
+URL = '/api/v1/titles/autocomplete/'
+
+
+def names(client, query, **params):
+    response = client.get(URL, {'q': query, **params})
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что эндпоинт `{URL}` доступен без токена.'
+    )
+    return [item['name'] for item in response.json()]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Autocomplete:
+
+    def test_01_prefix_and_rank(self, client):
+        for name, rating, count in (
+            ('Крепкий орешек', 7.0, 3),
+            ('Крёстный отец', 9.5, 10),
+            ('Кролик Роджер', 7.0, 8),
+            ('Гордость и предубеждение', None, 0),
+        ):
+            Title.objects.create(
+                name=name, year=2000, rating=rating, review_count=count
+            )
+        assert names(client, 'кр') == [
+            'Крёстный отец', 'Кролик Роджер', 'Крепкий орешек'
+        ], (
+            'Проверьте, что подсказки ищут по началу названия без учёта '
+            'регистра и упорядочены по рейтингу и числу отзывов.'
+        )
+        assert names(client, 'КРЕСТ') == ['Крёстный отец']
+        assert names(client, 'ореш') == ['Крепкий орешек'], (
+            'Проверьте, что подсказки ищут и по началу слов названия.'
+        )
+        assert names(client, 'кр', limit=1) == ['Крёстный отец']
+        assert names(client, '') == []
+
+        with CaptureQueriesContext(connection) as context:
+            client.get(URL, {'q': 'гор'})
+        assert len(context) == 0, (
+            'Проверьте, что подсказки не обращаются к БД.'
+        )
+
+    def test_02_viewset_writes(self, admin_client):
+        title = Title.objects.create(name='Старое название', year=2000)
+        assert names(admin_client, 'стар') == ['Старое название']
+        admin_client.patch(
+            f'/api/v1/titles/{title.id}/',
+            data={'name': 'Новое название'},
+            format='json'
+        )
+        assert names(admin_client, 'стар') == []
+        assert names(admin_client, 'нов') == ['Новое название'], (
+            'Проверьте, что изменение произведения сразу видно в подсказках.'
+        )
+        admin_client.delete(f'/api/v1/titles/{title.id}/')
+        assert names(admin_client, 'нов') == []
+
+    def test_03_incremental_updates(self, admin_client, monkeypatch):
+        monkeypatch.setattr(autocomplete, 'DELTA_LIMIT', 3)
+        titles = [
+            Title.objects.create(name=f'Старое {idx}', year=2000)
+            for idx in range(4)
+        ]
+        assert len(names(admin_client, 'стар')) == 4
+        for title in titles:
+            admin_client.patch(
+                f'/api/v1/titles/{title.id}/',
+                data={'name': f'Новое {title.id}'},
+                format='json'
+            )
+            assert f'Новое {title.id}' in names(admin_client, 'нов')
+        _, _, _, added, removed, _ = autocomplete.title_index.data
+        assert len(added) + len(removed) <= 3, (
+            'Проверьте, что накопленные изменения сливаются с основным '
+            'списком подсказок.'
+        )
+        assert names(admin_client, 'стар') == []
+        assert len(names(admin_client, 'нов')) == 4
+        admin_client.delete(f'/api/v1/titles/{titles[0].id}/')
+        assert len(names(admin_client, 'нов')) == 3
+
+    def test_04_top_k_matches_full_scan(self):
+        words = ('кот', 'кит', 'крот', 'дом', 'дым', 'свет', 'север')
+        titles = {
+            pk: (
+                ' '.join(words[(pk * step) % len(words)] for step in (1, 3)),
+                (pk * 7) % 11 or None,
+                pk % 5
+            )
+            for pk in range(1, 500)
+        }
+        index = autocomplete.PrefixIndex()
+        index.data = index.merged([], titles, [], frozenset(), {})
+        for prefix in ('к', 'кр', 'с', 'север', 'дом к', 'нет'):
+            expected = sorted(
+                (pk for pk, row in titles.items() if any(
+                    key.startswith(prefix)
+                    for key, _ in autocomplete.index_keys(pk, row[0])
+                )),
+                key=lambda pk: autocomplete.rank_key(pk, titles[pk])
+            )[:10]
+            assert [
+                item['id'] for item in index.search(prefix, 10)
+            ] == expected, (
+                'Проверьте, что подсказки возвращают лучшие по рейтингу '
+                'названия с префиксом.'
+            )
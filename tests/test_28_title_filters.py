@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.fixture
+def catalog():
+    movie = Category.objects.create(name='Фильм', slug='movie')
+    book = Category.objects.create(name='Книга', slug='book')
+    music = Category.objects.create(name='Музыка', slug='music')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    rock = Genre.objects.create(name='Рок', slug='rock')
+    for name, year, category, genres in (
+        ('Первое', 1980, movie, (drama,)),
+        ('Второе', 1990, movie, (drama, comedy)),
+        ('Третье', 2000, book, (comedy,)),
+        ('Четвёртое', 2010, music, (rock,)),
+    ):
+        title = Title.objects.create(name=name, year=year, category=category)
+        title.genre.set(genres)
+
+
+def names(client, query):
+    response = client.get(f'/api/v1/titles/?{query}')
+    assert response.status_code == 200, (
+        f'Проверьте, что запрос `/api/v1/titles/?{query}` возвращает 200.'
+    )
+    return sorted(item['name'] for item in response.json()['results'])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28TitleFilters:
+
+    def test_01_year_range(self, client, catalog):
+        assert names(client, 'year_min=1990&year_max=2000') == [
+            'Второе', 'Третье'
+        ], 'Проверьте фильтры `year_min` и `year_max`.'
+        assert names(client, 'year_min=2001') == ['Четвёртое']
+
+    def test_02_genres(self, client, catalog):
+        assert names(client, 'genre=drama,comedy') == [
+            'Второе', 'Первое', 'Третье'
+        ], (
+            'Проверьте, что `genre` через запятую находит произведения '
+            'с любым из жанров без повторов.'
+        )
+        assert names(client, 'genre=drama,comedy&genre_match=all') == [
+            'Второе'
+        ], 'Проверьте, что `genre_match=all` требует все жанры.'
+        assert names(client, 'genre=drama,missing&genre_match=all') == []
+        assert names(client, 'genre=drama,missing') == ['Второе', 'Первое']
+        response = client.get('/api/v1/titles/?genre=drama&genre_match=x')
+        assert response.status_code == 400
+
+    def test_03_categories(self, client, catalog):
+        assert names(client, 'category=book,music') == [
+            'Третье', 'Четвёртое'
+        ], 'Проверьте, что `category` принимает несколько slug через запятую.'
+
+    def test_04_no_distinct(self, client, catalog):
+        client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as context:
+            client.get('/api/v1/titles/?genre=drama,comedy&genre_match=all')
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'DISTINCT' not in sql and 'HAVING' in sql, (
+            'Проверьте, что фильтр по всем жанрам выполняется через '
+            'GROUP BY/HAVING по TitleGenre без DISTINCT.'
+        )
@@ -0,0 +1,114 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from reviews.models import Category, Genre, Review, Title, TitleActivity
+
+
+def names(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, (
+        f'Проверьте, что эндпоинт `{url}` доступен без токена.'
+    )
+    return [item['name'] for item in response.json()]
+
+
+@pytest.fixture
+def titles(admin, user, moderator):
+    movie = Category.objects.create(name='Фильм', slug='movie')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    result = []
+    for name, category, scores in (
+        ('Первое', movie, (10, 8)),
+        ('Второе', None, (9,)),
+        ('Третье', movie, (3, 4, 5)),
+        ('Без отзывов', movie, ()),
+    ):
+        title = Title.objects.create(name=name, year=2000, category=category)
+        for author, score in zip((admin, user, moderator), scores):
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=score
+            )
+        result.append(title)
+    result[2].genre.add(drama)
+    return result
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Rankings:
+
+    def test_01_top(self, client, titles):
+        assert names(client, '/api/v1/titles/top/') == [
+            'Первое', 'Второе', 'Третье'
+        ], (
+            'Проверьте, что `/api/v1/titles/top/` упорядочен по рейтингу '
+            'и не содержит произведений без оценок.'
+        )
+        assert names(client, '/api/v1/titles/top/?category=movie') == [
+            'Первое', 'Третье'
+        ]
+        assert names(client, '/api/v1/titles/top/?genre=drama') == ['Третье']
+        assert names(client, '/api/v1/titles/top/?genre=none') == []
+        assert names(client, '/api/v1/titles/top/?limit=1') == ['Первое']
+
+    def test_02_top_plan(self):
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется только для SQLite')
+        plan = Title.objects.filter(
+            is_deleted=False, rating__isnull=False
+        ).order_by('-rating', 'id')[:10].explain()
+        assert 'title_top_idx' in plan and 'TEMP B-TREE' not in plan, (
+            'Проверьте, что лучшие произведения читаются по индексу '
+            'без сортировки.'
+        )
+
+    def test_03_trending(self, client, titles, admin, settings):
+        assert names(client, '/api/v1/titles/trending/') == [
+            'Третье', 'Первое', 'Второе'
+        ], (
+            'Проверьте, что `/api/v1/titles/trending/` упорядочен по числу '
+            'новых отзывов.'
+        )
+        Review.objects.filter(title=titles[2], author=admin).delete()
+        assert Title.objects.get(pk=titles[2].pk).trending == 2, (
+            'Проверьте, что удаление отзыва уменьшает счётчик трендов.'
+        )
+
+        settings.TRENDING_WINDOW_DAYS = 1
+        TitleActivity.objects.update(
+            day=timezone.localdate() - timedelta(days=1)
+        )
+        TitleActivity.objects.create(
+            title=titles[1], day=timezone.localdate(), reviews=1
+        )
+        call_command('compact_rankings', stdout=StringIO())
+        assert list(Title.objects.filter(trending__gt=0).values_list(
+            'name', 'trending'
+        )) == [('Второе', 1)], (
+            'Проверьте, что `compact_rankings` убирает из трендов отзывы '
+            'старше окна.'
+        )
+        assert TitleActivity.objects.count() == 1
+        assert names(client, '/api/v1/titles/trending/') == ['Второе']
+
+    def test_04_deleted_author(self, client, titles, user_superuser_client):
+        response = user_superuser_client.delete('/api/v1/users/TestAdmin/')
+        assert response.status_code == 204
+        trending = dict(Title.objects.values_list('name', 'trending'))
+        assert trending == {
+            'Первое': 1, 'Второе': 0, 'Третье': 2, 'Без отзывов': 0
+        }, (
+            'Проверьте, что удаление пользователя вычитает его отзывы '
+            'из трендов.'
+        )
+        assert names(client, '/api/v1/titles/trending/') == [
+            'Третье', 'Первое'
+        ]
+        call_command('compact_rankings', stdout=StringIO())
+        assert dict(Title.objects.values_list('name', 'trending')) == (
+            trending
+        ), 'Проверьте, что `compact_rankings` не возвращает удалённые отзывы.'
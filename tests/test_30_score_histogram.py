@@ -0,0 +1,84 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+
+
+def histogram(**counts):
+    return [counts.get(f's{score}', 0) for score in range(1, 11)]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30ScoreHistogram:
+
+    def test_01_review_writes(self, user_client, admin_client, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        for client, score in ((user_client, 7), (admin_client, 3)):
+            response = client.post(
+                url, data={'text': 'Отзыв', 'score': score}, format='json'
+            )
+            assert response.status_code == 201
+        title.refresh_from_db()
+        assert title.score_histogram() == histogram(s3=1, s7=1), (
+            'Проверьте, что создание отзыва увеличивает счётчик его оценки.'
+        )
+
+        review_url = f'{url}{user.reviews.get().id}/'
+        response = user_client.patch(
+            review_url, data={'score': 9}, format='json'
+        )
+        assert response.status_code == 200
+        title.refresh_from_db()
+        assert title.score_histogram() == histogram(s3=1, s9=1), (
+            'Проверьте, что смена оценки переносит её в другой счётчик.'
+        )
+
+        assert user_client.delete(review_url).status_code == 204
+        title.refresh_from_db()
+        assert title.score_histogram() == histogram(s3=1), (
+            'Проверьте, что удаление отзыва уменьшает счётчик его оценки.'
+        )
+
+    def test_02_median(self, admin, user, moderator):
+        title = Title.objects.create(name='Произведение', year=2000)
+        assert title.score_median() is None
+        for author, score, median in (
+            (admin, 2, 2), (user, 10, 6), (moderator, 5, 5)
+        ):
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=score
+            )
+            title.refresh_from_db()
+            assert title.score_median() == median, (
+                'Проверьте, что медиана считается по гистограмме.'
+            )
+
+    def test_03_optional_field(self, client, admin):
+        title = Title.objects.create(name='Произведение', year=2000)
+        Review.objects.create(title=title, author=admin, text='Отзыв', score=4)
+        url = f'/api/v1/titles/{title.id}/'
+        data = client.get(url).json()
+        assert 'score_histogram' not in data
+        assert 'score_median' not in data
+        data = client.get(f'{url}?histogram=true').json()
+        assert data['score_histogram'] == histogram(s4=1), (
+            'Проверьте, что `?histogram=true` добавляет гистограмму оценок.'
+        )
+        assert data['score_median'] == 4
+        data = client.get('/api/v1/titles/?histogram=1').json()
+        assert data['results'][0]['score_histogram'] == histogram(s4=1)
+
+    def test_04_rebuild(self, admin):
+        title = Title.objects.create(name='Произведение', year=2000)
+        Review.objects.create(title=title, author=admin, text='Отзыв', score=8)
+        Title.objects.filter(pk=title.pk).update(score_8=0, score_1=3)
+        out = StringIO()
+        call_command('rebuild_aggregates', stdout=out)
+        assert 'исправлено расхождений: 1' in out.getvalue(), (
+            'Проверьте, что `rebuild_aggregates` сверяет гистограмму.'
+        )
+        title.refresh_from_db()
+        assert title.score_histogram() == histogram(s8=1)